@@ -1,15 +1,28 @@
     # ...existing code...
-from flask import Flask, request, jsonify, send_from_directory
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.utils import secure_filename, safe_join
 from werkzeug.security import generate_password_hash, check_password_hash
+from itsdangerous import URLSafeTimedSerializer, BadSignature
 from flask_cors import CORS
+import datetime
+import hashlib
+import io
+import mimetypes
 import os
 import sys
 import platform
+import threading
+import time
 
-from pymongo import MongoClient
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import pathlib
 # Robust .env loading for EXE and dev
 def robust_load_dotenv():
@@ -30,6 +43,8 @@ def robust_load_dotenv():
         print("[WARNING] .env file not found in any expected location!")
 
 robust_load_dotenv()
+# Per-request diagnostics (resume previews etc.); startup messages always print
+DEBUG = os.environ.get('LIVE_INSIGHTS_DEBUG', '0') == '1'
 from gpt_engine import GPTEngine
 from resume_parser import extract_text_from_pdf
 
@@ -48,28 +63,160 @@ def get_frontend_build_dir() -> str:
 FRONTEND_BUILD_DIR = get_frontend_build_dir()
 print(f"[DEBUG] Frontend build exists: {os.path.exists(FRONTEND_BUILD_DIR)}")
 
+# Precompressed variants tried in order of preference; written at build time by
+# precompress_static.py (.gz) or the frontend build (.br), never at startup
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
 # --- MongoDB Atlas connection ---
 # Replace with your actual MongoDB Atlas connection string
 MONGO_URI = os.environ.get('MONGO_URI', 'YOUR_MONGODB_ATLAS_CONNECTION_STRING')
-client = MongoClient(MONGO_URI)
-db = client['ai_assistant']
-users_col = db['users']
+# How long a parsed resume's text is kept in Mongo after it was last uploaded
+RESUME_TEXT_TTL_SEC = int(os.environ.get('RESUME_TEXT_TTL_SEC', 7 * 24 * 3600))
+# MongoClient is created on first DB use so processes that never touch Mongo skip the import
+_DB = None
+_DB_LOCK = threading.Lock()
+
+def get_db():
+    global _DB
+    if _DB is None:
+        with _DB_LOCK:
+            if _DB is None:
+                from pymongo import MongoClient
+                client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=50,
+                    minPoolSize=5,
+                    waitQueueTimeoutMS=2000,
+                    retryWrites=True,
+                    compressors=os.environ.get('MONGO_COMPRESSORS', 'zlib'),
+                )
+                db = client['ai_assistant']
+                try:
+                    db['users'].create_index('email', unique=True)
+                except Exception as e:
+                    print(f"[WARNING] Could not ensure users.email index: {e}")
+                try:
+                    # Cached resume texts have no owner; Mongo deletes each one RESUME_TEXT_TTL_SEC after its last write
+                    db['resume_texts'].create_index('ts', expireAfterSeconds=RESUME_TEXT_TTL_SEC)
+                    # Entries cached before the TTL existed have no ts and would never expire
+                    db['resume_texts'].update_many({'ts': {'$exists': False}},
+                                                   {'$set': {'ts': datetime.datetime.now(datetime.timezone.utc)}})
+                except Exception as e:
+                    print(f"[WARNING] Could not ensure resume_texts.ts TTL index: {e}")
+                _DB = db
+    return _DB
+
+def get_users_col():
+    return get_db()['users']
+
+def get_resumes_col():
+    return get_db()['resume_texts']
+
+# Only the fields the auth/credit paths actually read
+USER_PROJECTION = {'_id': 0, 'email': 1, 'password': 1, 'credits': 1}
+
+# Short-lived cache of user docs so auth + credit lookups share one Mongo read
+_USER_CACHE = TTLCache(maxsize=10_000, ttl=5)
+_USER_CACHE_LOCK = threading.Lock()
 
 def get_user(email):
-    return users_col.find_one({'email': email})
+    with _USER_CACHE_LOCK:
+        user = _USER_CACHE.get(email)
+    if user is not None:
+        return user
+    user = get_users_col().find_one({'email': email}, USER_PROJECTION)
+    if user is not None:
+        with _USER_CACHE_LOCK:
+            _USER_CACHE[email] = user
+    return user
+
+def invalidate_user(email):
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(email, None)
 
 def create_user(email, password):
     if get_user(email):
         return False
     hashed = generate_password_hash(password)
-    users_col.insert_one({'email': email, 'password': hashed, 'credits': 10})
+    get_users_col().insert_one({'email': email, 'password': hashed, 'credits': 10})
+    invalidate_user(email)
     return True
 
 def authenticate(email, password):
+    """Return the user doc if the credentials are valid, else None."""
     user = get_user(email)
-    if not user:
-        return False
-    return check_password_hash(user['password'], password)
+    if not user or not check_password_hash(user['password'], password):
+        return None
+    return user
+
+# Signed login tokens: verifying one is an HMAC, not a pbkdf2 hash per request.
+# Without SECRET_KEY the key is generated once and kept on disk, so tokens survive
+# restarts and every worker process signs with the same key
+def default_secret_key_file():
+    if getattr(sys, 'frozen', False):
+        # PyInstaller's _MEIPASS is a temp dir deleted on exit; keep the key per user
+        return os.path.expanduser('~/.live_insights_secret_key')
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '.secret_key')
+
+SECRET_KEY_FILE = os.environ.get('SECRET_KEY_FILE') or default_secret_key_file()
+
+def load_secret_key():
+    key = os.environ.get('SECRET_KEY')
+    if key:
+        return key
+    try:
+        with open(SECRET_KEY_FILE) as f:
+            key = f.read().strip()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[WARNING] Could not read {SECRET_KEY_FILE}: {e}")
+    key = os.urandom(32).hex()
+    # Write a private temp file, then link it into place: linking fails if another
+    # worker got there first, and whatever is at the path is always a complete key
+    tmp = f"{SECRET_KEY_FILE}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key)
+        try:
+            os.link(tmp, SECRET_KEY_FILE)
+            print(f"[WARNING] SECRET_KEY not set; generated one and stored it in {SECRET_KEY_FILE}")
+        except FileExistsError:
+            with open(SECRET_KEY_FILE) as f:
+                key = f.read().strip()
+        finally:
+            os.remove(tmp)
+    except OSError as e:
+        print(f"[WARNING] Could not persist {SECRET_KEY_FILE} ({e}); tokens will not survive a restart")
+    return key
+
+SECRET_KEY = load_secret_key()
+TOKEN_MAX_AGE = int(os.environ.get('TOKEN_MAX_AGE', 7 * 24 * 3600))
+_token_serializer = URLSafeTimedSerializer(SECRET_KEY, salt='auth-token')
+
+def issue_token(email):
+    return _token_serializer.dumps(email)
+
+def verify_token(token):
+    """Return the email a token was issued for, or None if invalid/expired."""
+    try:
+        return _token_serializer.loads(token, max_age=TOKEN_MAX_AGE)
+    except BadSignature:
+        return None
+
+def authenticate_request(data):
+    """Resolve (email, user) from a token if given, else from email/password."""
+    email = data.get('email')
+    token = data.get('token')
+    if token:
+        token_email = verify_token(token)
+        if token_email and (not email or email == token_email):
+            return token_email, get_user(token_email)
+        return email, None
+    return email, authenticate(email, data.get('password'))
 
 def get_credits(email):
     user = get_user(email)
@@ -78,13 +225,62 @@ def get_credits(email):
     return user.get('credits', 0)
 
 def use_credit(email):
-    user = get_user(email)
-    if not user or user.get('credits', 0) <= 0:
-        return False
-    users_col.update_one({'email': email}, {'$inc': {'credits': -1}})
-    return True
+    """Atomically spend one credit; return the remaining credits, or None if none were left."""
+    from pymongo import ReturnDocument
+    updated = get_users_col().find_one_and_update(
+        {'email': email, 'credits': {'$gt': 0}},
+        {'$inc': {'credits': -1}},
+        projection={'_id': 0, 'credits': 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    invalidate_user(email)
+    if updated is None:
+        return None
+    return updated.get('credits', 0)
+
+# Parsed resume text keyed by SHA-1 of the uploaded bytes; Mongo copy is shared across processes
+_RESUME_CACHE = LRUCache(maxsize=512)
+_RESUME_CACHE_LOCK = threading.Lock()
+
+def get_cached_resume_text(resume_hash):
+    with _RESUME_CACHE_LOCK:
+        text = _RESUME_CACHE.get(resume_hash)
+    if text is not None:
+        return text
+    try:
+        doc = get_resumes_col().find_one({'_id': resume_hash}, {'text': 1})
+    except Exception:
+        doc = None
+    if doc is None:
+        return None
+    with _RESUME_CACHE_LOCK:
+        _RESUME_CACHE[resume_hash] = doc['text']
+    return doc['text']
+
+def cache_resume_text(resume_hash, text):
+    if not text or not text.strip():
+        return
+    with _RESUME_CACHE_LOCK:
+        _RESUME_CACHE[resume_hash] = text
+    try:
+        get_resumes_col().update_one({'_id': resume_hash},
+                                     {'$set': {'text': text, 'ts': datetime.datetime.now(datetime.timezone.utc)}},
+                                     upsert=True)
+    except Exception as e:
+        print(f"[WARNING] Could not persist resume text cache: {e}")
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (falls back to stdlib when not installed)."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__, static_folder=FRONTEND_BUILD_DIR, static_url_path='')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # OS-safe absolute upload directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -95,6 +291,36 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_DIR
 # Allow requests from frontend
 CORS(app)
 
+@app.before_request
+def serve_precompressed_asset():
+    # React's hashed bundles live under /static/; serve a .br/.gz sibling when the client accepts it
+    if request.method != 'GET' or not request.path.startswith('/static/'):
+        return None
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        # Parsed header, so "br;q=0" counts as refused rather than matching as a substring
+        if request.accept_encodings.quality(encoding) <= 0:
+            continue
+        compressed = safe_join(FRONTEND_BUILD_DIR, request.path.lstrip('/') + suffix)
+        if compressed and os.path.isfile(compressed):
+            mimetype = mimetypes.guess_type(request.path)[0] or 'application/octet-stream'
+            resp = send_file(compressed, mimetype=mimetype)
+            resp.headers['Content-Encoding'] = encoding
+            resp.headers['Vary'] = 'Accept-Encoding'
+            return resp
+    return None
+
+@app.after_request
+def set_cache_headers(resp):
+    if request.path.startswith('/static/'):
+        if resp.status_code not in (200, 304):
+            # A 404 for a not-yet-deployed bundle must not stick in caches for a year
+            return resp
+        # Filenames are content-hashed, so they never change in place
+        resp.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    elif request.path in ('/', '/index.html'):
+        resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
 # --- Auth & Credits Endpoints ---
 @app.route('/signup', methods=['POST'])
 def signup():
@@ -118,30 +344,31 @@ def login():
     data = request.json
     email = data.get('email')
     password = data.get('password')
-    if authenticate(email, password):
-        return jsonify({'success': True, 'message': 'Login successful'})
+    user = authenticate(email, password)
+    if user:
+        # Credits ride along so clients don't need a second /get_credits round-trip
+        # exp lets clients reuse the token on later launches without logging in again
+        return jsonify({'success': True, 'message': 'Login successful', 'token': issue_token(email),
+                        'exp': int(time.time()) + TOKEN_MAX_AGE, 'credits': user.get('credits', 0)})
     else:
         return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
 
 @app.route('/get_credits', methods=['POST'])
 def get_credits_route():
     data = request.json
-    email = data.get('email')
-    password = data.get('password')
-    if authenticate(email, password):
-        credits = get_credits(email)
-        return jsonify({'success': True, 'credits': credits})
+    email, user = authenticate_request(data)
+    if user:
+        return jsonify({'success': True, 'credits': user.get('credits', 0)})
     else:
         return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
 
 @app.route('/use_credit', methods=['POST'])
 def use_credit_route():
     data = request.json
-    email = data.get('email')
-    password = data.get('password')
-    if authenticate(email, password):
-        if use_credit(email):
-            credits = get_credits(email)
+    email, user = authenticate_request(data)
+    if user:
+        credits = use_credit(email)
+        if credits is not None:
             return jsonify({'success': True, 'credits': credits})
         else:
             return jsonify({'success': False, 'message': 'No credits left'}), 403
@@ -150,19 +377,89 @@ def use_credit_route():
 
 gpt_engine = GPTEngine()
 
+# Whisper model is loaded once and shared across requests
+WHISPER_BATCH_SIZE = int(os.environ.get('WHISPER_BATCH_SIZE', 8))
+_WHISPER_MODEL = None
+_WHISPER_LOCK = threading.Lock()
+
+def get_whisper_model():
+    global _WHISPER_MODEL
+    if _WHISPER_MODEL is None:
+        with _WHISPER_LOCK:
+            if _WHISPER_MODEL is None:
+                # Use 'base' for speed, 'small' or 'medium' for accuracy
+                model_name = os.environ.get('WHISPER_MODEL', 'base')
+                # int8 on CPU; use WHISPER_COMPUTE_TYPE=int8_float16 on GPU
+                device = os.environ.get('WHISPER_DEVICE', 'cpu')
+                compute_type = os.environ.get('WHISPER_COMPUTE_TYPE', 'int8')
+                print(f"[DEBUG] Loading Whisper model: {model_name} ({device}, {compute_type})")
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+                # Batched pipeline splits speech with VAD and encodes the chunks as one batch
+                _WHISPER_MODEL = BatchedInferencePipeline(
+                    model=WhisperModel(model_name, device=device, compute_type=compute_type)
+                )
+    return _WHISPER_MODEL
+
+# Optional OpenVINO GenAI pipeline on an Intel GPU/NPU; needs an exported model dir in WHISPER_OV_MODEL_PATH
+_OV_PIPELINE = None
+_OV_CHECKED = False
+# One pipeline owns one infer request; concurrent /listen calls take turns on it
+_OV_GENERATE_LOCK = threading.Lock()
+OV_PREFERRED_DEVICES = ('NPU', 'GPU')
+
+def get_openvino_whisper():
+    """Return a WhisperPipeline on GPU/NPU if configured and available, else None."""
+    global _OV_PIPELINE, _OV_CHECKED
+    if _OV_CHECKED:
+        return _OV_PIPELINE
+    with _WHISPER_LOCK:
+        if _OV_CHECKED:
+            return _OV_PIPELINE
+        model_path = os.environ.get('WHISPER_OV_MODEL_PATH')
+        if model_path:
+            try:
+                import openvino
+                import openvino_genai
+                available = openvino.Core().available_devices
+                device = next((d for pref in OV_PREFERRED_DEVICES for d in available if d.startswith(pref)), None)
+                if device:
+                    # CACHE_DIR keeps compiled kernels so later launches skip compilation
+                    cache_dir = os.environ.get('WHISPER_OV_CACHE_DIR',
+                                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ov_cache'))
+                    _OV_PIPELINE = openvino_genai.WhisperPipeline(model_path, device, CACHE_DIR=cache_dir)
+                    print(f"[DEBUG] Whisper running on OpenVINO device: {device}")
+            except Exception as e:
+                print(f"[WARNING] OpenVINO Whisper unavailable, using faster-whisper: {e}")
+        _OV_CHECKED = True
+    return _OV_PIPELINE
+
+def transcribe_audio(audio_buf):
+    """Transcribe an in-memory audio file with the best available Whisper backend."""
+    pipeline = get_openvino_whisper()
+    if pipeline is not None:
+        from faster_whisper import decode_audio
+        audio = decode_audio(audio_buf, sampling_rate=16000)
+        samples = audio.tolist()
+        with _OV_GENERATE_LOCK:
+            result = pipeline.generate(samples, language='<|en|>', task='transcribe')
+        return result.texts[0].strip()
+    model = get_whisper_model()
+    # vad_filter skips silence and cuts speech into chunks, beam_size=1 is greedy decoding.
+    # The batched pipeline decodes each chunk on its own (no previous-text prompt), so
+    # memory scales with batch_size rather than with the length of the audio.
+    segments, _ = model.transcribe(audio_buf, language='en', vad_filter=True, beam_size=1,
+                                   batch_size=WHISPER_BATCH_SIZE)
+    return ''.join(seg.text for seg in segments).strip()
+
 @app.route('/listen', methods=['POST'])
 def listen():
     # Accept audio file (WAV) and transcribe with Whisper
-    import tempfile
-    import whisper
     if 'audio' not in request.files:
         return jsonify({'error': 'No audio file uploaded.'}), 400
     audio_file = request.files['audio']
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=True) as tmp:
-        audio_file.save(tmp.name)
-        model = whisper.load_model('base')  # Use 'base' for speed, 'small' or 'medium' for accuracy
-        result = model.transcribe(tmp.name, language='en')
-        text = result.get('text', '').strip()
+    # Decode straight from the uploaded bytes (no temp file / ffmpeg subprocess)
+    audio_buf = io.BytesIO(audio_file.stream.read())
+    text = transcribe_audio(audio_buf)
     return jsonify({'text': text})
 
 @app.route('/transcribe', methods=['POST'])
@@ -180,90 +477,132 @@ def health():
     })
 
 
-@app.route('/ask', methods=['POST'])
-def ask():
-    # Log the OS type for each request (cross-platform support)
-    print(f"[DEBUG] Backend running on OS: {platform.system()} {platform.release()} ({platform.platform()})")
+def parse_ask_request():
+    """Shared request parsing for /ask and /ask_stream.
+
+    Returns (params, None) on success or (None, error_response) to return as-is.
+    """
+    is_multipart = bool(request.content_type and request.content_type.startswith('multipart/form-data'))
     # Block if user has no credits
     email = None
-    if request.content_type and request.content_type.startswith('multipart/form-data'):
+    token = None
+    if is_multipart:
         email = request.form.get('email', None)
+        token = request.form.get('token', None)
     else:
         data = request.get_json(silent=True)
         if data:
             email = data.get('email', None)
+            token = data.get('token', None)
+    if token:
+        email = verify_token(token) or email
     if email:
         user = get_user(email)
         if not user or user.get('credits', 0) <= 0:
-            return jsonify({'answer': 'No credits left. Please purchase more credits to continue.'}), 403
+            return None, (jsonify({'answer': 'No credits left. Please purchase more credits to continue.'}), 403)
     # If multipart/form-data, handle file upload
-    if request.content_type and request.content_type.startswith('multipart/form-data'):
+    if is_multipart:
         question = request.form.get('question', '')
         mode = request.form.get('mode', 'global')
         history = request.form.get('history', None)
         resume_file = request.files.get('resume')
         resume_text = None
+        if not resume_file and request.form.get('resume_hash'):
+            # Client already uploaded this resume; reuse the text extracted then
+            resume_text = get_cached_resume_text(request.form['resume_hash'])
+            if resume_text is None:
+                return None, (jsonify({'answer': '', 'resume_required': True}), 409)
         if resume_file:
             filename = secure_filename(resume_file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-            resume_file.save(file_path)
-            # Always use the same logic as desktop: parse PDF or text
-            if filename.lower().endswith('.pdf'):
-                resume_text = extract_text_from_pdf(file_path)
-            else:
-                # Try to parse as text, fallback to empty string if error
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        resume_text = f.read()
-                except Exception:
-                    resume_text = ''
-            # Debug print: show filename and first 200 chars of resume text
-            print(f"[DEBUG] Resume file received: {filename}")
-            print(f"[DEBUG] Resume text length: {len(resume_text) if resume_text else 0}")
-            print("[DEBUG] Resume text preview (first 200 chars):\n", (resume_text or '')[:200])
+            resume_bytes = resume_file.read()
+            resume_hash = hashlib.sha1(resume_bytes).hexdigest()
+            resume_text = get_cached_resume_text(resume_hash)
+            if resume_text is None:
+                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+                with open(file_path, 'wb') as f:
+                    f.write(resume_bytes)
+                # Always use the same logic as desktop: parse PDF or text
+                if filename.lower().endswith('.pdf'):
+                    resume_text = extract_text_from_pdf(file_path)
+                else:
+                    # Try to parse as text, fallback to empty string if error
+                    try:
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            resume_text = f.read()
+                    except Exception:
+                        resume_text = ''
+                cache_resume_text(resume_hash, resume_text)
+            elif DEBUG:
+                print(f"[DEBUG] Resume text cache hit: {resume_hash}")
+            if DEBUG:
+                # Debug print: show filename and first 200 chars of resume text
+                print(f"[DEBUG] Resume file received: {filename}")
+                print(f"[DEBUG] Resume text length: {len(resume_text) if resume_text else 0}")
+                print("[DEBUG] Resume text preview (first 200 chars):\n", (resume_text or '')[:200])
             if not resume_text or not resume_text.strip():
                 print(f"[WARNING] Resume text is empty after extraction for file: {filename}")
-        else:
-            resume_text = None
         # Parse history if present
-        import json as _json
         if history:
             try:
-                history = _json.loads(history)
+                history = app.json.loads(history)
             except Exception:
                 history = []
         else:
             history = []
         if not question:
-            return jsonify({'answer': 'No question provided.'}), 400
+            return None, (jsonify({'answer': 'No question provided.'}), 400)
         
         # CRITICAL FIX: If Smart mode is requested, ALWAYS use resume mode regardless of resume_text
         if mode == 'resume':
-            print(f"[DEBUG] Smart mode requested - using resume context (resume_text_len={len(resume_text) if resume_text else 0})")
+            if DEBUG:
+                print(f"[DEBUG] Smart mode requested - using resume context (resume_text_len={len(resume_text) if resume_text else 0})")
             if not resume_text or not resume_text.strip():
-                return jsonify({
+                return None, (jsonify({
                     'answer': 'Could not extract any text from the uploaded resume. If your PDF is a scanned image, try a text-based PDF or upload a .txt file instead.',
                     'resume_text': ''
-                }), 422
-            answer = gpt_engine.generate_response(question, resume_text=resume_text, mode="resume", history=history)
-            return jsonify({'answer': answer, 'resume_text': resume_text})
+                }), 422)
         else:
-            # Global mode
-            answer = gpt_engine.generate_response(question, resume_text=resume_text, mode="global", history=history)
-            return jsonify({'answer': answer})
+            mode = 'global'
+        return {'question': question, 'mode': mode, 'history': history,
+                'resume_text': resume_text, 'echo_resume': mode == 'resume'}, None
     # Else, handle JSON (old flow)
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     question = data.get('question', '')
-    resume = data.get('resume', None)
-    mode = data.get('mode', 'global')
-    history = data.get('history', [])
     if not question:
-        return jsonify({'answer': 'No question provided.'}), 400
-    answer = gpt_engine.generate_response(question, resume_text=resume, mode=mode, history=history)
+        return None, (jsonify({'answer': 'No question provided.'}), 400)
+    return {'question': question, 'mode': data.get('mode', 'global'), 'history': data.get('history', []),
+            'resume_text': data.get('resume', None), 'echo_resume': False}, None
+
+
+@app.route('/ask', methods=['POST'])
+def ask():
+    params, error = parse_ask_request()
+    if error:
+        return error
+    answer = gpt_engine.generate_response(params['question'], resume_text=params['resume_text'],
+                                          mode=params['mode'], history=params['history'])
+    if params['echo_resume']:
+        return jsonify({'answer': answer, 'resume_text': params['resume_text']})
     return jsonify({'answer': answer})
 
 
+@app.route('/ask_stream', methods=['POST'])
+def ask_stream():
+    """Server-Sent Events variant of /ask: `delta` frames, then one `done` frame with the final answer."""
+    params, error = parse_ask_request()
+    if error:
+        return error
+
+    def events():
+        for event in gpt_engine.generate_response_stream(params['question'], resume_text=params['resume_text'],
+                                                         mode=params['mode'], history=params['history']):
+            yield f"data: {app.json.dumps(event)}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_frontend(path: str):
@@ -272,7 +611,27 @@ def serve_frontend(path: str):
     return app.send_static_file(path)
 
 
+def serve(host, port):
+    """Run the app on waitress so slow /ask and /listen calls don't serialize each other.
+
+    On Linux servers you can instead run:
+        gunicorn -k gthread --workers 2 --threads 16 api_server:app
+    """
+    threads = int(os.environ.get('WSGI_THREADS', 16))
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        print("[WARNING] waitress not installed; falling back to Flask's threaded dev server")
+        # Werkzeug defaults to HTTP/1.0 and closes every socket; 1.1 lets the client's pooled connections stay open
+        from werkzeug.serving import WSGIRequestHandler
+        WSGIRequestHandler.protocol_version = "HTTP/1.1"
+        app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+        return
+    print(f"[DEBUG] Serving with waitress on {host}:{port} ({threads} threads)")
+    waitress_serve(app, host=host, port=port, threads=threads)
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
-    app.run(host=host, port=port, debug=False)
+    serve(host, port)
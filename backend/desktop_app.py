@@ -1,8 +1,11 @@
 
 # --- NEW: Add Python-based speech recognition ---
 
+import io
+import queue
 import threading
 import time
+import wave
 import webview
 import os
 import sys
@@ -29,14 +32,98 @@ def expose_quit_api():
                 quit()
         return Api()
 
-from api_server import app
+LOADING_HTML = "<html><body style='background:transparent'></body></html>"
 
 def run_flask():
+    # Imported here so the window can appear while the backend modules load
+    from api_server import serve
     host = os.environ.get('HOST', '127.0.0.1')
     port = int(os.environ.get('PORT', 5000))
-    app.run(host=host, port=port, debug=False, use_reloader=False)
+    serve(host, port)
+
+def load_when_ready(window, url, timeout=60):
+    # Poll /health, then point the already-visible window at the app
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url + 'health', timeout=0.5)
+            break
+        except Exception:
+            time.sleep(0.1)
+    window.load_url(url)
+
+LISTEN_URL = 'http://127.0.0.1:5000/listen'
+
+# VAD capture: 16 kHz mono int16 in 30 ms frames (what webrtcvad expects)
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_FRAME_SAMPLES = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000
+VAD_SILENCE_TAIL_MS = 500
+# Continuous speech (or a TV in the background) is flushed at this length, pause or not
+VAD_MAX_PHRASE_SEC = 15
+VAD_AGGRESSIVENESS = 2
+
+def transcribe_via_backend(session, wav_bytes):
+    # Transcribe with the backend's already-loaded Whisper instead of a Google round-trip
+    try:
+        r = session.post(LISTEN_URL, files={'audio': ('speech.wav', io.BytesIO(wav_bytes), 'audio/wav')}, timeout=60)
+        text = r.json().get('text', '')
+        if text:
+            print(f'[VOICE] Recognized: {text}')
+        else:
+            print('[VOICE] Could not understand audio')
+    except Exception as e:
+        print(f'[VOICE] Failed to transcribe via backend: {e}')
+
+def pcm_to_wav(pcm):
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(VAD_SAMPLE_RATE)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+def run_vad_listener(session):
+    """Open the mic once and flush voiced audio to Whisper after a short silence tail."""
+    import sounddevice as sd
+    import webrtcvad
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    frames = queue.Queue()
+    tail_frames = VAD_SILENCE_TAIL_MS // VAD_FRAME_MS
+    max_frames = VAD_MAX_PHRASE_SEC * 1000 // VAD_FRAME_MS
+
+    def on_audio(indata, frame_count, time_info, status):
+        frames.put(bytes(indata))
+
+    with sd.RawInputStream(samplerate=VAD_SAMPLE_RATE, blocksize=VAD_FRAME_SAMPLES,
+                           dtype='int16', channels=1, callback=on_audio):
+        print('Voice listening started (VAD). Speak into your microphone...')
+        voiced = []
+        silent = 0
+        while True:
+            # Blocks between frames, so an idle listener costs almost no CPU
+            frame = frames.get()
+            if vad.is_speech(frame, VAD_SAMPLE_RATE):
+                voiced.append(frame)
+                silent = 0
+            elif voiced:
+                voiced.append(frame)
+                silent += 1
+            if voiced and (silent >= tail_frames or len(voiced) >= max_frames):
+                transcribe_via_backend(session, pcm_to_wav(b''.join(voiced)))
+                voiced = []
+                silent = 0
 
 def run_speech_recognition():
+    session = requests.Session()
+    try:
+        run_vad_listener(session)
+        return
+    except ImportError:
+        print('sounddevice/webrtcvad not installed. Falling back to speech_recognition.')
+    except Exception as e:
+        print(f'[VOICE] VAD listener failed ({e}). Falling back to speech_recognition.')
     try:
         import speech_recognition as sr
     except ImportError:
@@ -44,23 +131,14 @@ def run_speech_recognition():
         return
     recognizer = sr.Recognizer()
     mic = sr.Microphone()
+    # Calibrate once; re-running it per utterance adds a second of dead time each loop
+    with mic as source:
+        recognizer.adjust_for_ambient_noise(source)
     print('Voice listening started. Speak into your microphone...')
     while True:
         with mic as source:
-            recognizer.adjust_for_ambient_noise(source)
             audio = recognizer.listen(source)
-        try:
-            text = recognizer.recognize_google(audio)
-            print(f'[VOICE] Recognized: {text}')
-            # Send recognized text to backend /listen endpoint
-            try:
-                requests.post('http://127.0.0.1:5000/listen', json={'text': text})
-            except Exception as e:
-                print(f'[VOICE] Failed to send to backend: {e}')
-        except sr.UnknownValueError:
-            print('[VOICE] Could not understand audio')
-        except sr.RequestError as e:
-            print(f'[VOICE] Recognition error: {e}')
+        transcribe_via_backend(session, audio.get_wav_data())
 
 def main():
     flask_thread = threading.Thread(target=run_flask, daemon=True)
@@ -70,14 +148,13 @@ def main():
     speech_thread = threading.Thread(target=run_speech_recognition, daemon=True)
     speech_thread.start()
 
-    # Wait for server to be up
-    time.sleep(1.5)
     url = 'http://127.0.0.1:5000/'
 
     # Create truly stealth window - transparent, frameless, undetectable
+    # Shown immediately with a blank page; the app URL loads once the server answers
     window = webview.create_window(
         'System Monitor',  # Stealth title
-        url, 
+        html=LOADING_HTML,
         width=900, 
         height=600, 
         resizable=True,
@@ -93,6 +170,7 @@ def main():
         x=100,
         y=100
     )
+    threading.Thread(target=load_when_ready, args=(window, url), daemon=True).start()
     # Expose the quit API to JS (compatible with PyWebView 3.x and 4.x)
     api = expose_quit_api()
     webview.start(api, debug=False)
@@ -1,29 +1,60 @@
 import os
 import re
-from openai import OpenAI
+import sys
 from dotenv import load_dotenv
 
+# Compiled once at import; these run on every /ask
+_INTRO_RE = re.compile(
+    r"tell me about yourself|about yourself|introduce yourself|give .* introduction|self introduction|yourself"
+)
+
+# Per-request prompt/answer dumps; off unless LIVE_INSIGHTS_DEBUG=1 (they print the resume)
+DEBUG = os.environ.get("LIVE_INSIGHTS_DEBUG", "0") == "1"
+
+# Longer phrases like "here is a template" or "for example" are already caught by their
+# shorter substrings, so only the minimal set is scanned.
+BLOCKED_PHRASES = frozenset((
+    "template", "sample", "example", "generic", "fallback", "instructional", "structured", "suggested",
+    "possible answer", "response:", "for instance",
+))
+# One pass over the answer instead of one substring search per phrase
+_BLOCKED_RE = re.compile("|".join(re.escape(p) for p in sorted(BLOCKED_PHRASES, key=len, reverse=True)))
+EMPTY_RESUME_MESSAGE = (
+    "Could not extract any text from the uploaded resume. If your PDF is a scanned image, "
+    "try a text-based PDF or upload a .txt file instead."
+)
+BLOCKED_MESSAGE = "[Error: The answer was blocked because it looked like a template or sample. Please rephrase your question.]"
+MAX_HISTORY_MESSAGES = 10
+RETRY_INSTRUCTION = (
+    "Your previous draft read like a template. Reply with only the final first-person answer: "
+    "no headings, no numbered steps, no 'sample' or 'example' wording."
+)
+
+
+def is_template(text):
+    """True if an answer is empty or uses template/sample wording (the BLOCKED_PHRASES check)."""
+    text = text.strip().lower()
+    return not text or _BLOCKED_RE.search(text) is not None
+
+
 class GPTEngine:
     def __init__(self):
         load_dotenv()
-        api_key = os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=api_key)
+        self._client = None
 
-    def generate_response(self, question, resume_text=None, mode="global", history=None):
-        if not question.strip():
-            return "No question provided."
-        
-        import sys
-        print(f"[DEBUG] generate_response called with mode={mode}, resume_text_len={len(resume_text) if resume_text else 0}")
-        sys.stdout.flush()
-        
+    @property
+    def client(self):
+        # openai pulls in httpx/pydantic; import it on the first completion, not at boot
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    def _build_messages(self, question, resume_text, mode, history):
+        """Return (messages, temperature) for a chat completion."""
         is_intro = self._is_intro_question(question)
         
         if mode == "resume":
-            if not resume_text or not resume_text.strip():
-                return ("Could not extract any text from the uploaded resume. If your PDF is a scanned image, try a text-based PDF or upload a .txt file instead.")
-            # Smart mode: Use resume context if possible, else give a direct answer. STRONG anti-template instructions.
-            # ...existing code...
             # Smart mode: Use resume context if possible, else give a direct answer. STRONG anti-template instructions.
             if is_intro:
                 system_prompt = (
@@ -33,17 +64,12 @@ class GPTEngine:
                 )
             else:
                 system_prompt = (
-                    "You are an interview assistant. Answer ONLY using the resume below. If the resume does not cover the question, answer the question directly in the user's point of view (first-person), with a concise, practical, specific answer. "
+                    "You are an interview assistant. Answer from the facts in the resume below where they apply. If the resume does not cover the question, answer the question directly in the user's point of view (first-person), with a concise, practical, specific answer. "
                     "Do NOT use a template, structure, generic example, fallback message, or any instructional text. Do NOT say 'here is a template', 'sample answer', 'example', or anything similar. Only answer as the user would, based on resume facts.\n\nResume:\n" + resume_text
                 )
-            print("[DEBUG] SMART MODE PROMPT SENT TO OPENAI:\n", system_prompt[:1000])
-            sys.stdout.flush()
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            if history and isinstance(history, list) and len(history) > 0:
-                messages += history
-            messages.append({"role": "user", "content": question})
+            if DEBUG:
+                print("[DEBUG] SMART MODE PROMPT SENT TO OPENAI:\n", system_prompt[:1000])
+                sys.stdout.flush()
         else:
             # Global mode: answer purely general questions
             system_prompt = (
@@ -51,104 +77,109 @@ class GPTEngine:
                 "Focus on common interview questions, best practices, and general career advice. "
                 "Do not reference any specific resume or personal information unless provided in the conversation."
             )
-            print(f"[DEBUG] GLOBAL MODE PROMPT SENT TO OPENAI:\n{system_prompt}")
+            if DEBUG:
+                print(f"[DEBUG] GLOBAL MODE PROMPT SENT TO OPENAI:\n{system_prompt}")
+                sys.stdout.flush()
+        # Most recent turns only; one list build instead of append + extend
+        recent = history[-MAX_HISTORY_MESSAGES:] if isinstance(history, list) else []
+        messages = [{"role": "system", "content": system_prompt}, *recent, {"role": "user", "content": question}]
+        temperature = 0.5 if (mode == "resume" and is_intro) else (0.45 if mode == "resume" else 0.7)
+        return messages, temperature
+
+    def generate_response(self, question, resume_text=None, mode="global", history=None):
+        if not question.strip():
+            return "No question provided."
+        
+        if DEBUG:
+            print(f"[DEBUG] generate_response called with mode={mode}, resume_text_len={len(resume_text) if resume_text else 0}")
             sys.stdout.flush()
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            if history and isinstance(history, list) and len(history) > 0:
-                messages += history
-            messages.append({"role": "user", "content": question})
+        
+        if mode == "resume" and (not resume_text or not resume_text.strip()):
+            return EMPTY_RESUME_MESSAGE
+        messages, temperature = self._build_messages(question, resume_text, mode, history)
 
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=messages,
                 max_tokens=512,
-                temperature=(0.5 if (mode == "resume" and is_intro) else (0.45 if mode == "resume" else 0.7)),
+                temperature=temperature,
             )
             answer = response.choices[0].message.content.strip()
-            # --- STRICTEST SMART MODE FILTER (ENHANCED) ---
+            # --- SMART MODE TEMPLATE FILTER ---
+            # One call normally; only a template-looking answer earns a single stricter retry.
             if mode == "resume" and resume_text and resume_text.strip():
-                import re as _re
-                forbidden_phrases = [
-                    "as an ai language model", "as an interview assistant", "i'm sorry", "i am unable to", "i cannot answer",
-                    "based on the information provided", "based on your resume", "template", "sample", "example", "generic", "fallback", "instructional", "structured", "suggested", "possible answer", "general answer", "response:",
-                    "this is a template", "here is a template", "here is an example", "here is a sample", "sample response", "for example", "for instance", "let's", "in summary", "in conclusion", "overall", "as an ", "as a ", "to answer"
-                ]
-                template_patterns = [
-                    r"^answer[:\-]", r"^template[:\-]", r"^sample answer[:\-]", r"^example[:\-]", r"^suggested answer[:\-]", r"^possible answer[:\-]", r"^response[:\-]", r"^here is", r"^this is", r"^let's", r"^to answer", r"^in summary", r"^in conclusion", r"^overall", r"^as an? ",
-                ]
-                def is_template(text, resume_text):
-                    text = text.strip().lower()
-                    if not text:
-                        return True
-                    if any(phrase in text for phrase in forbidden_phrases):
-                        return True
-                    if any(_re.match(p, text, _re.IGNORECASE) for p in template_patterns):
-                        return True
-                    # Block if answer contains numbered/stepwise/list structure
-                    if any(text.startswith(x) for x in ["1.", "step 1", "first,", "here's a structured", "here is a structured", "here is how", "here's how", "to answer this question, you should", "to answer this question:", "here are some steps", "here are some ways", "here are some points", "here are some tips", "here are some suggestions"]):
-                        return True
-                    # Block if answer contains multiple numbered points or bullet points
-                    if any(x in text for x in ["2.", "3.", "4.", "- ", "• "]):
-                        return True
-                    # Block if answer is long but does not mention any unique resume keyword
-                    resume_keywords = set(w.lower() for w in _re.findall(r"[A-Za-z]{4,}", resume_text))
-                    answer_words = set(w.lower() for w in _re.findall(r"[A-Za-z]{4,}", text))
-                    if len(text) > 60 and len(resume_keywords & answer_words) == 0:
-                        return True
-                    # Block if answer starts with a generic phrase and does not mention any resume keyword
-                    generic_starts = ["i am", "my name is", "i have", "i possess", "i am a", "i'm a", "i'm an"]
-                    if any(text.startswith(gs) for gs in generic_starts) and len(resume_keywords & answer_words) == 0:
-                        return True
-                    return False
-                # In Smart mode, always return the OpenAI-generated answer unless it is a template or forbidden phrase.
-                # If answer is not based on resume context (no overlap with resume keywords), provide a general answer (not a template).
-                forbidden = [
-                    "template", "sample", "example", "generic", "fallback", "instructional", "structured", "suggested", "possible answer", "response:",
-                    "this is a template", "here is a template", "here is an example", "here is a sample", "sample response", "for example", "for instance"
-                ]
-                # Check for forbidden phrases
-                if any(f in answer.lower() for f in forbidden):
-                    answer = "[Error: The answer was blocked because it looked like a template or sample. Please rephrase your question.]"
-                else:
-                    # Check if answer is based on resume context (overlap with resume keywords)
-                    resume_keywords = set(w.lower() for w in _re.findall(r"[A-Za-z]{4,}", resume_text))
-                    answer_words = set(w.lower() for w in _re.findall(r"[A-Za-z]{4,}", answer))
-                    # If no overlap and resume doesn't cover the question, provide a general answer (not a template)
-                    if len(resume_keywords & answer_words) == 0:
-                        # General mode system prompt
-                        general_prompt = (
-                            "You are a helpful interview assistant. Provide a concise, practical, and specific answer to the user's question. Do not use a template, sample, or generic structure. Answer in first person as if you are the user."
-                        )
-                        messages = [
-                            {"role": "system", "content": general_prompt},
-                            {"role": "user", "content": question}
-                        ]
-                        try:
-                            response2 = self.client.chat.completions.create(
-                                model="gpt-4o",
-                                messages=messages,
-                                max_tokens=256,
-                                temperature=0.6,
-                            )
-                            answer2 = response2.choices[0].message.content.strip()
-                            # Block if general answer is a template
-                            if any(f in answer2.lower() for f in forbidden):
-                                answer = "[Error: The answer was blocked because it looked like a template or sample. Please rephrase your question.]"
-                            else:
-                                answer = answer2
-                        except Exception as e:
-                            answer = "[Error: Could not generate a general answer.]"
-            print(f"[DEBUG] Answer returned (mode={mode}): {answer[:300]}")
-            sys.stdout.flush()
+                if is_template(answer):
+                    answer = self._retry_template(messages)
+            if DEBUG:
+                print(f"[DEBUG] Answer returned (mode={mode}): {answer[:300]}")
+                sys.stdout.flush()
             return answer
         except Exception as e:
             print(f"[DEBUG] Exception in generate_response: {e}")
             sys.stdout.flush()
             return "[Error: Could not generate answer.]"
 
+    def generate_response_stream(self, question, resume_text=None, mode="global", history=None):
+        """Yield {'delta': text} chunks as they arrive, then {'done': True, 'answer': final}.
+
+        The Smart-mode template filter runs on the completed answer; if it fires, one
+        stricter retry (or BLOCKED_MESSAGE) replaces what was streamed.
+        """
+        if not question.strip():
+            yield {"done": True, "answer": "No question provided."}
+            return
+        if mode == "resume" and (not resume_text or not resume_text.strip()):
+            yield {"done": True, "answer": EMPTY_RESUME_MESSAGE}
+            return
+        messages, temperature = self._build_messages(question, resume_text, mode, history)
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                max_tokens=512,
+                temperature=temperature,
+                stream=True,
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield {"delta": delta}
+        except Exception as e:
+            print(f"[DEBUG] Exception in generate_response_stream: {e}")
+            sys.stdout.flush()
+            yield {"done": True, "answer": "[Error: Could not generate answer.]"}
+            return
+        answer = "".join(parts).strip()
+        if mode == "resume" and is_template(answer):
+            # Same single stricter retry as generate_response (not streamed; it replaces the draft)
+            answer = self._retry_template(messages)
+        yield {"done": True, "answer": answer}
+
+    def _retry_template(self, messages):
+        """Ask once more with RETRY_INSTRUCTION; BLOCKED_MESSAGE if that answer is a template too."""
+        if DEBUG:
+            print("[DEBUG] Answer looked like a template, retrying once")
+        # Reuse the same list; only the system message changes
+        messages[0] = {"role": "system", "content": messages[0]["content"] + "\n\n" + RETRY_INSTRUCTION}
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                max_tokens=512,
+                temperature=0.3,
+            )
+            answer = response.choices[0].message.content.strip()
+        except Exception:
+            answer = ""
+        if is_template(answer):
+            return BLOCKED_MESSAGE
+        return answer
+
     def build_prompt(self, question, resume_text, mode):
         # Kept for compatibility; main logic handled in generate_response
         if mode == "resume" and resume_text:
@@ -160,14 +191,5 @@ class GPTEngine:
             return f"You are a helpful interview assistant.\nQuestion: {question}\nAnswer:"
 
     def _is_intro_question(self, question: str) -> bool:
-        q = question.lower()
-        patterns = [
-            r"tell me about yourself",
-            r"about yourself",
-            r"introduce yourself",
-            r"give .* introduction",
-            r"self introduction",
-            r"yourself",
-        ]
-        return any(re.search(p, q) for p in patterns)
+        return _INTRO_RE.search(question.lower()) is not None
 
@@ -0,0 +1,35 @@
+"""Build step: write a .gz next to each compressible React build asset.
+
+Run after `npm run build` and before packaging, e.g.
+    python backend/precompress_static.py frontend/build
+api_server serves these siblings as-is; it never compresses at runtime.
+"""
+import gzip
+import os
+import sys
+
+COMPRESSIBLE_EXTS = ('.js', '.css', '.html', '.json', '.svg', '.map', '.txt')
+
+def precompress_static_assets(build_dir):
+    """Write a .gz next to each compressible build asset that lacks an up-to-date one."""
+    static_dir = os.path.join(build_dir, 'static')
+    if not os.path.isdir(static_dir):
+        print(f"[WARNING] No static dir under {build_dir}; nothing to precompress")
+        return
+    for dirpath, _, filenames in os.walk(static_dir):
+        for name in filenames:
+            if not name.endswith(COMPRESSIBLE_EXTS):
+                continue
+            src = os.path.join(dirpath, name)
+            dst = src + '.gz'
+            try:
+                if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src):
+                    continue
+                with open(src, 'rb') as f_in, gzip.open(dst, 'wb', compresslevel=9) as f_out:
+                    f_out.write(f_in.read())
+            except OSError as e:
+                print(f"[WARNING] Could not precompress {src}: {e}")
+
+if __name__ == '__main__':
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    precompress_static_assets(sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, 'frontend', 'build'))
@@ -1,5 +1,3 @@
-import fitz  
-
 def load_resume(file_path): 
     if file_path.endswith(".pdf"):
         return extract_text_from_pdf(file_path)
@@ -8,9 +6,9 @@ def load_resume(file_path):
             return f.read()
 
 def extract_text_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    doc.close()
+    # PyMuPDF documents are not thread-safe, so pages are read sequentially;
+    # "text" is the cheapest output format and join avoids quadratic concat.
+    import fitz  # PyMuPDF, imported on first PDF
+    with fitz.open(pdf_path) as doc:
+        text = "".join(page.get_text("text") for page in doc)
     return text.strip()
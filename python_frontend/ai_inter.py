@@ -1,38 +1,249 @@
 import sys
 import os
 import json
+import collections
+import functools
+import hashlib
+import importlib.util
 import time
 import threading
 import queue
 import tempfile
 import wave
-import requests
-import numpy as np
 import re # Added for regex in _format_answer_for_interview
 import platform
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from PySide6.QtCore import Qt, QTimer, QThread, Signal, QSize
-from PySide6.QtGui import QFont, QIcon, QAction, QShortcut, QKeySequence, QTextOption
+from PySide6.QtGui import QFont, QIcon, QAction, QShortcut, QKeySequence, QTextOption, QTextCursor
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
-    QTextEdit, QFileDialog, QStackedWidget, QFrame, QMessageBox, QSizePolicy, QSpacerItem,
+    QPlainTextEdit, QFileDialog, QStackedWidget, QFrame, QMessageBox, QSizePolicy, QSpacerItem,
     QSlider
 )
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 
 BACKEND_URL = "http://127.0.0.1:5000"
 
-HAVE_SPEECH_RECOGNITION = True
+# speech_recognition (PyAudio) and vosk are heavy; only check they exist here and
+# import them when listening actually starts, so the login window paints sooner
+HAVE_SPEECH_RECOGNITION = importlib.util.find_spec("speech_recognition") is not None
+HAVE_VOSK = importlib.util.find_spec("vosk") is not None
+HAVE_WHISPERCPP = importlib.util.find_spec("whispercpp") is not None
+sr = None
+np = None  # numpy is only needed once listening starts
+
+def _import_speech_recognition():
+    global sr
+    if sr is None:
+        import speech_recognition
+        sr = speech_recognition
+    return sr
+
+def _import_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+HAVE_WEBRTCVAD = True
 try:
-    import speech_recognition as sr
+    import webrtcvad
 except Exception:
-    HAVE_SPEECH_RECOGNITION = False
+    HAVE_WEBRTCVAD = False
+
+# Local VAD gate: 30 ms frames of 16 kHz 16-bit mono; skip STT if too few are voiced
+VAD_RATE = 16000
+VAD_FRAME_BYTES = VAD_RATE * 2 * 30 // 1000
+VAD_MIN_SPEECH_RATIO = 0.3
+
+# VAD-driven capture: end a phrase once speech stops instead of waiting out pause_threshold
+VAD_CAPTURE_RATES = (8000, 16000, 32000, 48000)  # rates webrtcvad accepts
+VAD_CAPTURE_FRAME_MS = 20
+VAD_CAPTURE_AGGRESSIVENESS = 3
+VAD_PRE_ROLL_FRAMES = 10       # keep 200 ms before onset so first syllables aren't clipped
+VAD_END_WINDOW_FRAMES = 25     # 500 ms sliding window for end-of-speech
+VAD_END_SPEECH_RATIO = 0.2
+VAD_MIN_SPEECH_MS = 300
+VAD_MAX_PHRASE_SEC = 15.0
+
+# Same question finalised twice this close together is a re-emit, not a new question
+DUPLICATE_SUPPRESS_SEC = 2.0
+
+# Status label updates from the listener are capped at 5 Hz; a change that lands inside
+# the window is held and sent when it closes, so the label always ends on the latest one
+STATUS_MIN_INTERVAL_SEC = 0.2
+
+# End-of-question heuristics used by SpeechRecognitionThread._maybe_finalize
+SENTENCE_END_CHARS = ("?", ".", "!", ":")
+CLOSING_PHRASES = ("thank you", "that's it", "that's all")
+QUESTION_STARTERS = (
+    "what ", "why ", "how ", "is ", "are ", "can ", "does ", "do ", "did ",
+    "will ", "would ", "should ", "could ", "tell me ", "explain ", "when ", "where ", "which "
+)
+
+# Local STT: vosk decodes on-device when installed; Google is only used as a fallback
+VOSK_LANG = os.environ.get("LIVE_INSIGHTS_VOSK_LANG", "en-us")
+VOSK_RATE = 16000
+GOOGLE_STT_FALLBACK = os.environ.get("LIVE_INSIGHTS_GOOGLE_FALLBACK", "1") != "0"
+# Offline fallback when Google fails: whisper.cpp if installed, else PocketSphinx
+WHISPERCPP_MODEL = os.environ.get("LIVE_INSIGHTS_WHISPER_MODEL", "base.en")
+# While a phrase is captured, vosk decodes it frame by frame and shows a partial this often
+VOSK_PARTIAL_FRAMES = 10  # x VAD_CAPTURE_FRAME_MS = 200 ms
+
+# Ambient calibration: short RMS read, threshold cached per input device across launches
+CALIBRATION_SEC = 0.3
+CALIBRATION_RMS_FACTOR = 3.5
+MIN_ENERGY_THRESHOLD = 300
+MIC_CAL_FILE = os.path.expanduser("~/.live_insights_mic_cal.json")
+# Cached thresholds older than this are re-measured; room noise drifts
+MIC_CAL_TTL_SEC = 24 * 3600
+
+# Capture at the rate Google/vosk/webrtcvad work in; native 44.1/48 kHz just triples the upload
+MIC_SAMPLE_RATE = 16000
+MIC_CHUNK = 1024
+
+def _make_microphone(device_index=None):
+    """sr.Microphone at 16 kHz if the device accepts it, else at its native rate."""
+    try:
+        pyaudio_module = sr.Microphone.get_pyaudio()
+        pa = pyaudio_module.PyAudio()
+        try:
+            info = pa.get_device_info_by_index(device_index) if device_index is not None else pa.get_default_input_device_info()
+            # Raises ValueError when the rate/format is unsupported
+            pa.is_format_supported(MIC_SAMPLE_RATE, input_device=info["index"], input_channels=1,
+                                   input_format=pyaudio_module.paInt16)
+        finally:
+            pa.terminate()
+        return sr.Microphone(device_index=device_index, sample_rate=MIC_SAMPLE_RATE, chunk_size=MIC_CHUNK)
+    except Exception:
+        return sr.Microphone(device_index=device_index)
+
+# Device-name patterns for _pick_microphone_index, compiled once instead of per-name substring loops
+_VIRTUAL_MIC_RE = re.compile("|".join(map(re.escape, (
+    'virtual', 'vb-audio', 'cable', 'stereo mix', 'mix', 'loopback',
+    'what u hear', 'what-you-hear', 'wave out', 'output', 'speaker',
+    'monitor of', 'line (voicemeeter', 'ndis', 'aux'
+))), re.I)
+_MIC_RE = re.compile(r"mic|array|headset", re.I)  # "mic" also covers "microphone"
+_OEM_RE = re.compile(r"realtek|intel|high definition audio|built-in|internal", re.I)
+
+def _score_microphone(name):
+    n = name.lower()
+    has_mic = bool(_MIC_RE.search(n))
+    score = 100 if has_mic else 0
+    if 'usb' in n:
+        score += 50
+    if _OEM_RE.search(n):
+        score += 20
+    if 'headphones' in n and not has_mic:
+        score -= 60
+    return score
+
+@functools.lru_cache(maxsize=1)
+def _pick_microphone_index(mic_names):
+    """Index of the most likely real microphone, skipping loopback/virtual devices; None for the default.
+
+    Takes a tuple so repeated starts with the same devices reuse the ranking.
+    """
+    candidates = [
+        (idx, _score_microphone(name))
+        for idx, name in enumerate(mic_names)
+        if not _VIRTUAL_MIC_RE.search(name)
+    ]
+    return max(candidates, key=lambda x: x[1])[0] if candidates else None
+
+@functools.lru_cache(maxsize=1)
+def _load_vosk_model():
+    """vosk model, loaded once per process; every Start reuses it instead of reloading from disk."""
+    from vosk import Model as VoskModel, SetLogLevel
+    SetLogLevel(-1)
+    return VoskModel(lang=VOSK_LANG)
+
+def _pcm16_to_f32(raw):
+    """Little-endian int16 PCM as float32 in [-1, 1): one vectorised cast, then an in-place scale."""
+    x = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    x *= np.float32(1.0 / 32768.0)
+    return x
+
+def _rms_int16(buf, scratch=None):
+    """RMS of little-endian int16 PCM; reuses `scratch` (float32) to avoid a temp per call."""
+    x = np.frombuffer(buf, dtype=np.int16)
+    if not x.size:
+        return 0.0
+    if scratch is None or scratch.size < x.size:
+        scratch = np.empty(x.size, dtype=np.float32)
+    xf = scratch[:x.size]
+    np.copyto(xf, x, casting="safe")
+    # sdot squares and sums in one vectorised pass; no squared temp, no second reduction
+    return float(np.sqrt(np.dot(xf, xf) / x.size))
+
+def _load_mic_calibration():
+    try:
+        with open(MIC_CAL_FILE, "r") as fp:
+            return json.load(fp)
+    except Exception:
+        return {}
+
+def _cached_mic_threshold(cal, key):
+    """Energy threshold saved for this device, or None if missing or stale."""
+    entry = cal.get(key)
+    if isinstance(entry, dict) and time.time() - entry.get("ts", 0) < MIC_CAL_TTL_SEC:
+        return entry.get("energy")
+    return None
+
+def _save_mic_calibration(key, threshold):
+    _update_mic_cache(key, {"energy": round(float(threshold), 1), "ts": time.time()})
+
+def _devices_hash(mic_list):
+    return hashlib.blake2b("|".join(mic_list).encode("utf-8"), digest_size=8).hexdigest()
+
+def _update_mic_cache(key, value):
+    try:
+        data = _load_mic_calibration()
+        data[key] = value
+        tmp = MIC_CAL_FILE + ".tmp"
+        with open(tmp, "w") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+        os.replace(tmp, MIC_CAL_FILE)
+    except Exception:
+        pass
 
 # Background executor to keep UI and listener responsive
 _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="AI_BG")
 
+# Email + signed token from the last login (never the password); valid until the token's exp
+SESSION_FILE = os.path.expanduser("~/.live_insights_session.json")
+
+# (connect, read) timeouts for auth calls
+AUTH_TIMEOUT = (3, 10)
+
+def _make_session(pool_maxsize=4, retries=1):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize,
+                          max_retries=Retry(total=retries, backoff_factor=0.2))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Shared keep-alive session for every backend call (auth, /ask, credits, logout);
+# sized for the background executor's workers plus the auth thread. Built (and
+# requests imported) on first use, which is the auth worker, not window startup
+_session = None
+_session_lock = threading.Lock()
+
+def _backend_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _make_session(pool_maxsize=8)
+    return _session
+
+@functools.lru_cache(maxsize=None)
 def glass(bg="rgba(0,0,0,0.5)"):
     return f"""
         background-color: {bg};
@@ -40,6 +251,7 @@ def glass(bg="rgba(0,0,0,0.5)"):
         color: #fff;
     """
 
+@functools.lru_cache(maxsize=None)
 def glass_panel(bg="rgba(35,35,35,0.85)"):
     return f"""
         background-color: {bg};
@@ -47,6 +259,7 @@ def glass_panel(bg="rgba(35,35,35,0.85)"):
         border-radius: 14px;
     """
 
+@functools.lru_cache(maxsize=None)
 def header_style():
     return """
         background-color: rgba(24,24,24,0.95);
@@ -58,9 +271,10 @@ def header_style():
         cursor: grab;
     """
 
+@functools.lru_cache(maxsize=None)
 def textedit_style():
     return """
-        QTextEdit {
+        QPlainTextEdit {
             background: rgba(40,40,40,0.95);
             border: none;
             border-radius: 10px;
@@ -85,6 +299,7 @@ def textedit_style():
         }
     """
 
+@functools.lru_cache(maxsize=None)
 def button_primary():
     return """
         QPushButton {
@@ -104,6 +319,7 @@ def button_primary():
         }
     """
 
+@functools.lru_cache(maxsize=None)
 def button_danger_round():
     return """
         QPushButton {
@@ -120,6 +336,7 @@ def button_danger_round():
         }
     """
 
+@functools.lru_cache(maxsize=None)
 def input_style():
     return """
         QLineEdit {
@@ -132,8 +349,246 @@ def input_style():
         }
     """
 
+# Stylesheets are constants: build the strings once instead of per widget
+QSS_GLASS = glass()
+QSS_BUTTON_PRIMARY = button_primary()
+QSS_LINK_BUTTON = """
+    QPushButton { background: transparent; color: #4F8CFF; border: none; }
+    QPushButton:hover { text-decoration: underline; }
+"""
+# MainView: one sheet, parsed once. `*` stands in for the bare glass() block (it matched
+# every child too); `#header, #header *` likewise keeps header_style() on the header's
+# children, and the per-widget rules come after it so they win the specificity tie
+QSS_MAIN_VIEW = (
+    "* {" + glass() + "}"
+    "#header, #header * {" + header_style() + "}"
+    """
+    #drag_handle { font-weight: 700; font-size: 16px; }
+    #smart_label { color: #aaa; font-size: 14px; }
+    #smart_label[on="true"] { color: #4CAF50; }
+    #credit_label { color: #4CAF50; font-weight: 700; }
+    QPushButton#logout_button { background: transparent; color: #fff; border: none; font-weight: 600; }
+    #section_heading { font-weight: 600; font-size: 15px; }
+    #tips_label { color: #aaa; font-size: 10px; line-height: 1.2; padding: 4px; }
+    """
+)
+# Login box: `*` matches the frame and its children like a bare declaration block would,
+# and the QLineEdit rule styles both inputs from this single parse
+QSS_AUTH_BODY = "* {" + glass_panel("rgba(0,0,0,0.7)") + "}" + input_style()
+QSS_TEXTEDIT = textedit_style()
+# Answers pane: larger, roomier text than the questions list
+QSS_ANSWERS_BOX = """
+    QPlainTextEdit {
+        background: rgba(40,40,40,0.95);
+        border: none;
+        border-radius: 10px;
+        color: #fff;
+        padding: 16px;
+        line-height: 1.8;
+        font-size: 15px;
+        font-family: 'Segoe UI', Arial, sans-serif;
+        font-weight: 500;
+    }
+    QScrollBar:vertical {
+        background: rgba(255,255,255,0.1);
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background: rgba(255,255,255,0.3);
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: rgba(255,255,255,0.5);
+    }
+"""
+# Listen button while listening
+QSS_BUTTON_STOP = """
+    QPushButton {
+        background: rgba(239,68,68,0.9);
+        color: white;
+        font-weight: 700;
+        border: none;
+        border-radius: 24px;
+        padding: 10px 16px;
+    }
+    QPushButton:hover {
+        background: rgba(239,68,68,1);
+    }
+    QPushButton:disabled {
+        background: #2b2b2b;
+        color: #888;
+    }
+"""
+QSS_RESIZE_HANDLE = """
+    QFrame { background-color: rgba(255,255,255,0.2); border-radius: 10px; }
+    QFrame:hover { background-color: rgba(255,255,255,0.4); }
+"""
+# Status label colours: ok / in progress / error; the small variants are the mic
+# label and the loaded-resume preview
+QSS_STATUS_OK = "color:#4CAF50; font-weight:600;"
+QSS_STATUS_BUSY = "color:#FFA500; font-weight:600;"
+QSS_STATUS_ERROR = "color:#f44336; font-weight:600;"
+QSS_STATUS_SMALL_OK = "color:#4CAF50; font-size:12px; font-weight:600;"
+QSS_STATUS_SMALL_BUSY = "color:#FFA500; font-size:12px; font-weight:600;"
+QSS_STATUS_SMALL_ERROR = "color:#f44336; font-size:12px; font-weight:600;"
+
+def _set_style(widget, qss):
+    # Re-applying an identical sheet still re-parses it and re-polishes the widget
+    if widget.styleSheet() != qss:
+        widget.setStyleSheet(qss)
+
+# Recognized fragments closer together than this are sent as one question; the
+# recognizer's own end-of-question wait already absorbs normal pauses
+SPEECH_DEBOUNCE_MS = 400
+
+# Questions kept (and shown) per session; older ones drop off the bottom of the list
+QUESTION_HISTORY_MAX = 200
+
+# Lines kept in the answers pane; Qt drops the oldest blocks past this itself
+ANSWER_MAX_BLOCKS = 500
+
+# Placeholder shown in the answers pane while a request is in flight
+THINKING_TEXT = "🤔 Processing..."
+
+# Only the start of a text resume is shown in the status label
+RESUME_PREVIEW_BYTES = 4096
+
+# Conversation context kept client-side (the backend sends at most the last 10)
+HISTORY_MAX_MESSAGES = 20
+
+# Answer formatting: pure functions of the text, so repeated renders hit the cache
+ERROR_INDICATORS = ("❌", "⏰", "🔌", "error", "timeout", "connection")
+STRUCTURED_OPENERS = (
+    "based on", "in my experience", "i would", "my approach",
+    "the key", "first", "second", "third", "finally",
+    "here's how", "let me", "i believe", "my strategy"
+)
+KEY_WORDS = frozenset({"key", "important", "critical", "essential", "main", "primary"})
+ACTION_WORDS = frozenset({"would", "will", "should", "could", "might"})
+_LEADING_NUM_RE = re.compile(r'^\d+\.')
+_LINE_WORD_RE = re.compile(r"[a-z]+")
+
+@functools.lru_cache(maxsize=512)
+def _format_answer(answer, answer_number):
+    """Format AI response in a systematic, interview-friendly way"""
+    if not answer or answer.strip() == "":
+        return ""
+        
+    # Clean up the answer
+    answer = answer.strip()
+    
+    # Check if it's an error message (one lowered copy for all indicators)
+    lowered = answer.lower()
+    if any(error_indicator in lowered for error_indicator in ERROR_INDICATORS):
+        return f"A{answer_number}: {answer}"
+    
+    # One plain paragraph (most short answers): nothing to split or structure
+    if "\n\n" not in answer and not any(pattern in answer[:50].lower() for pattern in STRUCTURED_OPENERS):
+        return f"A{answer_number}: {answer}"
+    
+    # Format systematic responses paragraph by paragraph; joined once at the end
+    parts = []
+    for paragraph in answer.split('\n\n'):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # If paragraph starts with common interview response patterns, format them
+        # Only the opening is checked, so lower just that instead of the whole paragraph
+        if any(pattern in paragraph[:50].lower() for pattern in STRUCTURED_OPENERS):
+            paragraph = _structure_paragraph(paragraph)
+        parts.append(paragraph)
+    
+    return f"A{answer_number}: " + "\n\n".join(parts)
+
+def _structure_paragraph(paragraph):
+    """Structure a paragraph for better readability"""
+    # Look for numbered or bullet points
+    lines = paragraph.split('\n')
+    structured = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Check for numbered lists (1., 2., etc.)
+        num = _LEADING_NUM_RE.match(line)
+        if num:
+            structured.append(f"• {line[num.end():].strip()}")
+            continue
+        # Check for bullet points
+        if line.startswith(('•', '-', '*')):
+            structured.append(f"• {line[1:].strip()}")
+            continue
+        # Whole words only, so "monkey" or "domain" no longer count as key phrases
+        words = set(_LINE_WORD_RE.findall(line.lower()))
+        # Check for key phrases that should be highlighted
+        if words & KEY_WORDS:
+            structured.append(f"🔑 {line}")
+        # Check for action items
+        elif words & ACTION_WORDS:
+            structured.append(f"→ {line}")
+        else:
+            structured.append(line)
+    
+    return "\n".join(structured).strip()
+
+# Callback capture ring: absorbs stalls in the capture loop instead of overflowing PortAudio
+RING_SECONDS = 5
+RING_FRAMES_PER_BUFFER = 512
+
+class _RingBufferStream:
+    """PyAudio callback input feeding a preallocated int16 ring; read(n) matches sr's MicrophoneStream."""
+
+    def __init__(self, pyaudio_module, audio, device_index, rate, fmt):
+        self._continue = pyaudio_module.paContinue
+        self._cap = rate * RING_SECONDS
+        self._ring = np.zeros(self._cap, dtype=np.int16)
+        self._written = 0  # total frames written / read; positions are taken modulo _cap
+        self._read = 0
+        self._cond = threading.Condition()
+        self._stream = audio.open(input_device_index=device_index, channels=1, format=fmt, rate=rate,
+                                  input=True, frames_per_buffer=RING_FRAMES_PER_BUFFER,
+                                  stream_callback=self._callback)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        x = np.frombuffer(in_data, dtype=np.int16)
+        n = x.size
+        with self._cond:
+            i = self._written % self._cap
+            first = min(n, self._cap - i)
+            self._ring[i:i + first] = x[:first]
+            self._ring[:n - first] = x[first:]
+            self._written += n
+            if self._written - self._read > self._cap:
+                # Reader fell a whole ring behind; drop the oldest audio
+                self._read = self._written - self._cap
+            self._cond.notify()
+        return (None, self._continue)
+
+    def read(self, size):
+        with self._cond:
+            while self._written - self._read < size and self._stream.is_active():
+                self._cond.wait(0.5)
+            n = min(size, self._written - self._read)
+            i = self._read % self._cap
+            first = min(n, self._cap - i)
+            out = self._ring[i:i + first].tobytes() + self._ring[:n - first].tobytes()
+            self._read += n
+        return out
+
+    def close(self):
+        try:
+            if not self._stream.is_stopped():
+                self._stream.stop_stream()
+        finally:
+            self._stream.close()
+
 class SpeechRecognitionThread(QThread):
     recognized = Signal(str)
+    partial = Signal(str)  # interim hypothesis for the phrase still being spoken
     error = Signal(str)
     listening_status = Signal(str)
 
@@ -162,6 +617,23 @@ class SpeechRecognitionThread(QThread):
         self._recalibrate_every_sec = 60.0
         self._last_recalibrate_ts = 0.0
         self._max_utterance_sec = 75.0  # hard cap to avoid waiting forever
+        self._last_emitted_text = ""
+        self._last_status = None
+        self._last_status_ts = 0.0
+        self._pending_status = None
+        self._status_timer = None
+        self._status_lock = threading.Lock()
+        self._last_emitted_ts = 0.0
+        self._vad = webrtcvad.Vad(2) if HAVE_WEBRTCVAD else None
+        self._capture_vad = webrtcvad.Vad(VAD_CAPTURE_AGGRESSIVENESS) if HAVE_WEBRTCVAD else None
+        # STT runs on a small pool; futures are kept in capture order
+        self._stt_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="STT")
+        self._pending = collections.deque()
+        self._fallback_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="STT_FALLBACK")
+        self._vosk_model = None
+        self._rms_scratch = None  # float32 scratch reused by calibration
+        self._sphinx = None  # PocketSphinx decoder, built on the fallback worker on first use
+        self._whisper = None  # whisper.cpp context, loaded on the fallback worker; False if unavailable
 
     def run(self):
         if not HAVE_SPEECH_RECOGNITION:
@@ -169,7 +641,16 @@ class SpeechRecognitionThread(QThread):
             return
         try:
             self.running = True
-            self.listening_status.emit("Initializing...")
+            self._emit_status("Initializing...")
+            _import_speech_recognition()
+            _import_numpy()
+
+            # Load the local model here, not in __init__, so the GUI thread never waits on it
+            if HAVE_VOSK and self._vosk_model is None:
+                try:
+                    self._vosk_model = _load_vosk_model()
+                except Exception as e:
+                    print(f"[WARNING] vosk model unavailable, using Google STT: {e}")
             
             # Initialize recognizer and microphone with balanced, interview-friendly settings
             self.recognizer = sr.Recognizer()
@@ -179,163 +660,351 @@ class SpeechRecognitionThread(QThread):
             self.recognizer.phrase_threshold = 0.08
             self.recognizer.dynamic_energy_threshold = True
             
-            # Microphone selection (best available)
+            # Microphone selection (best available); the pick is cached until the device list changes
+            mic_cal = _load_mic_calibration()
             try:
                 mic_list = sr.Microphone.list_microphone_names()
-                
-                def is_virtual(name: str) -> bool:
-                    n = name.lower()
-                    virtual_terms = [
-                        'virtual', 'vb-audio', 'cable', 'stereo mix', 'mix', 'loopback',
-                        'what u hear', 'what-you-hear', 'wave out', 'output', 'speaker',
-                        'monitor of', 'line (voicemeeter', 'ndis', 'aux'
-                    ]
-                    return any(t in n for t in virtual_terms)
-
-                def score_device(name: str) -> int:
-                    n = name.lower()
-                    score = 0
-                    if any(k in n for k in ['mic', 'microphone', 'array', 'headset']):
-                        score += 100
-                    if 'usb' in n:
-                        score += 50
-                    if any(k in n for k in ['realtek', 'intel', 'high definition audio', 'built-in', 'internal']):
-                        score += 20
-                    if 'headphones' in n and 'mic' not in n and 'microphone' not in n:
-                        score -= 60
-                    return score
-
-                candidates = [
-                    (idx, name, score_device(name))
-                    for idx, name in enumerate(mic_list)
-                    if not is_virtual(name)
-                ]
-
-                if candidates:
-                    best = max(candidates, key=lambda x: x[2])
-                    chosen_index = best[0]
-                    self.microphone = sr.Microphone(device_index=chosen_index)
+                devices_hash = _devices_hash(mic_list)
+                cached_device = mic_cal.get("device")
+                if isinstance(cached_device, dict) and cached_device.get("hash") == devices_hash:
+                    chosen_index = cached_device.get("index")
                 else:
-                    self.microphone = sr.Microphone()
+                    chosen_index = _pick_microphone_index(tuple(mic_list))
+                    _update_mic_cache("device", {"hash": devices_hash, "index": chosen_index})
+                self.microphone = _make_microphone(chosen_index)
             except Exception:
                 # Fallback to default microphone
-                self.microphone = sr.Microphone()
-            
-            # Initial ambient noise calibration
-            try:
-                with self.microphone as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.6)
-            except Exception:
-                pass
-            self._last_recalibrate_ts = time.time()
-            self._utterance_start_ts = 0.0
-            
-            self.listening_status.emit("Ready! Speak now!")
+                self.microphone = _make_microphone()
             
-            # Continuous loop: short timeout for start-of-speech detection, no phrase limit
-            while self.running:
-                try:
-                    now = time.time()
-                    # Periodic re-calibration in long sessions
-                    if now - self._last_recalibrate_ts > self._recalibrate_every_sec:
+            # Open the input stream once; re-entering the Microphone per loop reopens PortAudio
+            with self.microphone as source:
+                self._use_ring_buffer(source)
+                vad_capture = self._capture_vad is not None and source.SAMPLE_RATE in VAD_CAPTURE_RATES
+                # The energy threshold only drives recognizer.listen; webrtcvad capture never reads
+                # it, so with VAD there is nothing to calibrate and listening starts immediately
+                cal_key = str(self.microphone.device_index if self.microphone.device_index is not None else "default")
+                if not vad_capture:
+                    # Initial ambient noise calibration; reuse this mic's last threshold if we have one
+                    cached_threshold = _cached_mic_threshold(mic_cal, cal_key)
+                    if cached_threshold:
+                        self.recognizer.energy_threshold = float(cached_threshold)
+                    else:
                         try:
-                            with self.microphone as source:
-                                self.listening_status.emit("Adjusting for ambient noise...")
-                                self.recognizer.adjust_for_ambient_noise(source, duration=0.4)
-                            self._last_recalibrate_ts = time.time()
+                            self._calibrate(source)
+                            _save_mic_calibration(cal_key, self.recognizer.energy_threshold)
                         except Exception:
                             pass
-
-                    with self.microphone as source:
-                        self.listening_status.emit("Listening...")
-                        # Short timeout to detect start of speech quickly, no phrase limit to allow long answers
-                        audio = self.recognizer.listen(
-                            source,
-                            timeout=0.9,
-                            phrase_time_limit=None,
-                            snowboy_configuration=None
-                        )
-                    
-                    if not self.running:
-                        break
-                        
-                    self.listening_status.emit("Processing...")
-                    
-                    text = ""
-                    # Google first with alternatives
+                self._last_recalibrate_ts = time.time()
+                self._utterance_start_ts = 0.0
+            
+                self._emit_status("Ready! Speak now!")
+            
+                # Continuous loop: short timeout for start-of-speech detection, no phrase limit
+                while self.running:
                     try:
-                        result = self.recognizer.recognize_google(audio, language=self.language, show_all=True)
-                        if isinstance(result, dict) and 'alternative' in result:
-                            best_alt = None
-                            best_score = -1.0
-                            for alt in result['alternative']:
-                                transcript = alt.get('transcript', '')
-                                conf = float(alt.get('confidence', 0.0)) if 'confidence' in alt else 0.0
-                                score = conf if conf > 0 else (len(transcript) / 120.0)
-                                if transcript and score > best_score:
-                                    best_score = score
-                                    best_alt = transcript
-                            if best_alt:
-                                text = best_alt
-                        elif isinstance(result, str):
-                            text = result
+                        now = time.time()
+                        # Periodic re-calibration in long sessions (energy-based capture only; the
+                        # 0.3 s read would otherwise drop live audio for nothing)
+                        if not vad_capture and now - self._last_recalibrate_ts > self._recalibrate_every_sec:
+                            try:
+                                self._emit_status("Adjusting for ambient noise...")
+                                self._calibrate(source)
+                                _save_mic_calibration(cal_key, self.recognizer.energy_threshold)
+                                self._last_recalibrate_ts = time.time()
+                            except Exception:
+                                pass
+
+                        self._emit_status("Listening...")
+                        streamed_text = None
+                        if vad_capture:
+                            audio, streamed_text = self._listen_vad(source, timeout=0.9)
                         else:
-                            # fallback: try non-show_all
-                            text = self.recognizer.recognize_google(audio, language=self.language, show_all=False)
-                    except sr.UnknownValueError:
-                        # Try Sphinx as offline fallback
-                        try:
-                            text = self.recognizer.recognize_sphinx(audio, language=self.language)
-                        except Exception:
-                            text = ""
-                    except sr.RequestError:
-                        # Network issue, try Sphinx
-                        try:
-                            text = self.recognizer.recognize_sphinx(audio, language=self.language)
-                        except Exception:
-                            text = ""
-                    except Exception:
-                        text = ""
+                            # Short timeout to detect start of speech quickly, no phrase limit to allow long answers
+                            audio = self.recognizer.listen(source, timeout=0.9, phrase_time_limit=None)
                     
-                    text = (text or "").strip()
-                    if text:
-                        # Start utterance timing on first segment
-                        if self._utterance_start_ts == 0.0:
-                            self._utterance_start_ts = time.time()
-                        # Update buffer and timestamp; avoid naive duplicate concatenation
-                        if self._buffer_text:
-                            self._buffer_text = self._merge_transcript(self._buffer_text, text)
+                        if not self.running:
+                            break
+
+                        # Coughs, keystrokes and HVAC noise never reach Google; VAD capture already
+                        # segmented this phrase with webrtcvad, so only energy-based capture is gated
+                        if not vad_capture and not self._has_speech(audio):
+                            self._maybe_finalize()
+                            continue
+                        
+                        self._emit_status("Processing...")
+
+                        if streamed_text:
+                            # vosk already decoded this phrase while it was spoken
+                            done = Future()
+                            done.set_result(streamed_text)
+                            self._pending.append(done)
+                        elif streamed_text is not None:
+                            # vosk heard nothing decodable; go straight to Google/offline, not vosk again
+                            if GOOGLE_STT_FALLBACK:
+                                self._pending.append(self._stt_pool.submit(self._recognize_google, audio))
                         else:
-                            self._buffer_text = text
-                        self._last_speech_ts = time.time()
-                        # Any new speech cancels pending finalization
-                        self._pending_finalize_since = 0.0
-                        self.listening_status.emit("Captured segment...")
+                            # Recognize in the background so the mic keeps capturing during the STT round-trip
+                            self._pending.append(self._stt_pool.submit(self._recognize, audio))
                     
-                    # Decide whether to finalize based on silence and utterance characteristics
-                    self._maybe_finalize()
+                        # Decide whether to finalize based on silence and utterance characteristics
+                        self._maybe_finalize()
                     
-                except sr.WaitTimeoutError:
-                    # No speech detected during this short window; check finalize conditions
-                    self._maybe_finalize()
-                    if not self._buffer_text:
-                        self.listening_status.emit("Listening...")
-                    continue
-                except sr.UnknownValueError:
-                    # Inaudible; keep listening but also check if buffer should finalize
-                    self._maybe_finalize()
-                    continue
-                except sr.RequestError as e:
-                    self.listening_status.emit("Service error, retrying...")
-                    continue
-                except Exception as e:
-                    self.listening_status.emit("Error, retrying...")
-                    continue
+                    except sr.WaitTimeoutError:
+                        # No speech detected during this short window; check finalize conditions
+                        self._maybe_finalize()
+                        if not self._buffer_text:
+                            self._emit_status("Listening...")
+                        continue
+                    except sr.UnknownValueError:
+                        # Inaudible; keep listening but also check if buffer should finalize
+                        self._maybe_finalize()
+                        continue
+                    except sr.RequestError as e:
+                        self._emit_status("Service error, retrying...")
+                        continue
+                    except Exception as e:
+                        self._emit_status("Error, retrying...")
+                        continue
                     
         except Exception as e:
             self.error.emit(f"Failed to initialize speech recognition: {e}")
+        finally:
+            self._stt_pool.shutdown(wait=False, cancel_futures=True)
+            self._fallback_pool.shutdown(wait=False, cancel_futures=True)
+            self._pending.clear()
+
+    def _use_ring_buffer(self, source):
+        """Swap the Microphone's blocking stream for the callback ring; keep it if that can't open."""
+        try:
+            ring = _RingBufferStream(sr.Microphone.get_pyaudio(), source.audio, source.device_index,
+                                     source.SAMPLE_RATE, source.format)
+        except Exception as e:
+            print(f"[WARNING] Callback capture unavailable, using blocking reads: {e}")
+            return
+        source.stream.close()
+        source.stream = ring
+
+    def _listen_vad(self, source, timeout):
+        """Capture one phrase, ending it ~500 ms after webrtcvad stops hearing speech.
+
+        Returns (audio, text); text is vosk's transcript when the phrase was decoded as it
+        was captured, else None and the phrase goes through _recognize.
+        """
+        rate = source.SAMPLE_RATE
+        frame_samples = rate * VAD_CAPTURE_FRAME_MS // 1000
+        pre_roll = collections.deque(maxlen=VAD_PRE_ROLL_FRAMES)
+        window = collections.deque(maxlen=VAD_END_WINDOW_FRAMES)
+        frames = None
+        rec = None
+        last_partial = ""
+        speech_ms = 0
+        start = time.time()
+        while self.running:
+            frame = source.stream.read(frame_samples)
+            is_speech = self._capture_vad.is_speech(frame, rate)
+            if frames is None:
+                if is_speech:
+                    frames = list(pre_roll)
+                    start = time.time()
+                    rec = self._streaming_recognizer(rate, source.SAMPLE_WIDTH)
+                    if rec is not None:
+                        rec.AcceptWaveform(b"".join(frames))
+                elif time.time() - start > timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                else:
+                    pre_roll.append(frame)
+                    continue
+            frames.append(frame)
+            if rec is not None:
+                rec.AcceptWaveform(frame)
+                if len(frames) % VOSK_PARTIAL_FRAMES == 0:
+                    text = json.loads(rec.PartialResult()).get("partial", "")
+                    if text and text != last_partial:
+                        last_partial = text
+                        self.partial.emit(text)
+            window.append(is_speech)
+            if is_speech:
+                speech_ms += VAD_CAPTURE_FRAME_MS
+            if time.time() - start > VAD_MAX_PHRASE_SEC:
+                break
+            if (speech_ms >= VAD_MIN_SPEECH_MS and len(window) == window.maxlen
+                    and sum(window) < VAD_END_SPEECH_RATIO * window.maxlen):
+                break
+        audio = sr.AudioData(b"".join(frames or ()), rate, source.SAMPLE_WIDTH)
+        text = json.loads(rec.FinalResult()).get("text", "") if rec is not None else None
+        return audio, text
+
+    def _streaming_recognizer(self, rate, width):
+        """KaldiRecognizer fed live frames, or None when vosk can't take this stream as-is."""
+        if self._vosk_model is None or rate != VOSK_RATE or width != 2:
+            return None
+        try:
+            from vosk import KaldiRecognizer
+            return KaldiRecognizer(self._vosk_model, VOSK_RATE)
+        except Exception:
+            return None
+
+    def _calibrate(self, source, duration=CALIBRATION_SEC):
+        """Set the energy threshold from a short numpy RMS read of ambient noise."""
+        n_chunks = max(1, int(duration * source.SAMPLE_RATE / source.CHUNK))
+        buf = b"".join(source.stream.read(source.CHUNK) for _ in range(n_chunks))
+        if self._rms_scratch is None or self._rms_scratch.size < len(buf) // 2:
+            self._rms_scratch = np.empty(len(buf) // 2, dtype=np.float32)
+        rms = _rms_int16(buf, self._rms_scratch)
+        self.recognizer.energy_threshold = max(MIN_ENERGY_THRESHOLD, rms * CALIBRATION_RMS_FACTOR)
+
+    def _drain_results(self):
+        """Apply finished recognitions in capture order; stops at the first still in flight."""
+        while self._pending and self._pending[0].done():
+            try:
+                text = self._pending[0].result()
+            except Exception:
+                text = ""
+            if isinstance(text, Future):
+                # Handed off to the offline fallback; keep its place in the queue
+                self._pending[0] = text
+                continue
+            self._pending.popleft()
+            self._apply_text(text)
+
+    def _apply_text(self, text):
+        text = (text or "").strip()
+        if not text:
+            return
+        # Start utterance timing on first segment
+        if self._utterance_start_ts == 0.0:
+            self._utterance_start_ts = time.time()
+        # Update buffer and timestamp; avoid naive duplicate concatenation
+        if self._buffer_text:
+            self._buffer_text = self._merge_transcript(self._buffer_text, text)
+        else:
+            self._buffer_text = text
+        self._last_speech_ts = time.time()
+        # Any new speech cancels pending finalization
+        self._pending_finalize_since = 0.0
+        self._emit_status("Captured segment...")
+
+    def _recognize(self, audio):
+        """Transcribe one captured phrase: vosk first, then Google (which may hand off to the offline fallback)."""
+        text = self._recognize_vosk(audio) if self._vosk_model is not None else ""
+        if not text and (self._vosk_model is None or GOOGLE_STT_FALLBACK):
+            # May be a Future for the offline fallback; _drain_results waits on it in capture order
+            text = self._recognize_google(audio)
+        return text
+
+    def _recognize_vosk(self, audio):
+        """Decode one phrase locally; a fresh KaldiRecognizer per call keeps the two STT workers independent."""
+        try:
+            from vosk import KaldiRecognizer
+            rec = KaldiRecognizer(self._vosk_model, VOSK_RATE)
+            rec.AcceptWaveform(audio.get_raw_data(convert_rate=VOSK_RATE, convert_width=2))
+            return json.loads(rec.FinalResult()).get("text", "")
+        except Exception:
+            return ""
+
+    def _recognize_google(self, audio):
+        """Google STT; returns a Future instead of text when the offline fallback was queued."""
+        text = ""
+        if audio.sample_rate > MIC_SAMPLE_RATE:
+            # Device couldn't capture at 16 kHz; downsample before FLAC-encoding the upload
+            audio = sr.AudioData(audio.get_raw_data(convert_rate=MIC_SAMPLE_RATE, convert_width=2), MIC_SAMPLE_RATE, 2)
+        try:
+            result = self.recognizer.recognize_google(audio, language=self.language, show_all=True)
+            if isinstance(result, dict) and 'alternative' in result:
+                best_alt = None
+                best_score = -1.0
+                for alt in result['alternative']:
+                    transcript = alt.get('transcript', '')
+                    conf = float(alt.get('confidence', 0.0)) if 'confidence' in alt else 0.0
+                    score = conf if conf > 0 else (len(transcript) / 120.0)
+                    if transcript and score > best_score:
+                        best_score = score
+                        best_alt = transcript
+                if best_alt:
+                    text = best_alt
+            elif isinstance(result, str):
+                text = result
+            else:
+                # fallback: try non-show_all
+                text = self.recognizer.recognize_google(audio, language=self.language, show_all=False)
+        except (sr.UnknownValueError, sr.RequestError):
+            # Not understood or network issue: decode offline on its own worker (seconds of CPU)
+            return self._fallback_pool.submit(self._recognize_offline, audio)
+        except Exception:
+            text = ""
+        return text
+
+    def _sphinx_decoder(self):
+        """PocketSphinx decoder, built once (recognize_sphinx reloads the model every call); only the fallback worker uses it."""
+        decoder = self._sphinx
+        if decoder is None:
+            import pocketsphinx
+            lang_dir = os.path.join(os.path.dirname(os.path.realpath(sr.__file__)), "pocketsphinx-data", self.language)
+            config = pocketsphinx.Decoder.default_config()
+            config.set_string("-hmm", os.path.join(lang_dir, "acoustic-model"))
+            config.set_string("-lm", os.path.join(lang_dir, "language-model.lm.bin"))
+            config.set_string("-dict", os.path.join(lang_dir, "pronounciation-dictionary.dict"))
+            config.set_string("-logfn", os.devnull)
+            decoder = pocketsphinx.Decoder(config)
+            self._sphinx = decoder
+        return decoder
+
+    def _whisper_model(self):
+        """whisper.cpp context, loaded once; only ever touched from the single fallback worker."""
+        if self._whisper is None:
+            try:
+                from whispercpp import Whisper
+                self._whisper = Whisper.from_pretrained(WHISPERCPP_MODEL)
+            except Exception as e:
+                print(f"[WARNING] whisper.cpp unavailable, using Sphinx: {e}")
+                self._whisper = False
+        return self._whisper
+
+    def _recognize_offline(self, audio):
+        """Offline fallback: whisper.cpp when installed, else (or if it fails) PocketSphinx."""
+        whisper = self._whisper_model() if HAVE_WHISPERCPP else None
+        if whisper:
+            try:
+                return whisper.transcribe(_pcm16_to_f32(audio.get_raw_data(convert_rate=16000, convert_width=2))).strip()
+            except Exception as e:
+                print(f"[WARNING] whisper.cpp decode failed: {e}")
+        return self._recognize_sphinx(audio)
+
+    def _recognize_sphinx(self, audio):
+        try:
+            decoder = self._sphinx_decoder()
+        except Exception:
+            return ""
+        try:
+            decoder.start_utt()
+            decoder.process_raw(audio.get_raw_data(convert_rate=16000, convert_width=2), False, True)
+            decoder.end_utt()
+        except Exception as e:
+            print(f"[WARNING] Sphinx decode failed: {e}")
+            return ""
+        hyp = decoder.hyp()
+        return hyp.hypstr if hyp is not None else ""
+
+    def _has_speech(self, audio):
+        """True if enough 30 ms frames of the captured audio are voiced (always True without webrtcvad)."""
+        if self._vad is None:
+            return True
+        raw = audio.get_raw_data(convert_rate=VAD_RATE, convert_width=2)
+        n_frames = len(raw) // VAD_FRAME_BYTES
+        if n_frames == 0:
+            return False
+        voiced = 0
+        for i in range(n_frames):
+            start = i * VAD_FRAME_BYTES
+            if self._vad.is_speech(raw[start:start + VAD_FRAME_BYTES], VAD_RATE):
+                voiced += 1
+        return voiced >= n_frames * VAD_MIN_SPEECH_RATIO
 
     def _maybe_finalize(self):
+        self._drain_results()
+        if self._pending:
+            # Don't cut a question while part of it is still being recognized
+            return
         now = time.time()
         has_buffer = bool(self._buffer_text and self._last_speech_ts > 0)
         if not has_buffer:
@@ -343,15 +1012,11 @@ class SpeechRecognitionThread(QThread):
         silence = now - self._last_speech_ts
         utterance_duration = (now - self._utterance_start_ts) if self._utterance_start_ts > 0 else 0.0
         words = len(self._buffer_text.split())
-        ends_sentence = any(self._buffer_text.strip().endswith(p) for p in ["?", ".", "!", ":"]) or \
-                        any(k in self._buffer_text.lower() for k in ["thank you", "that's it", "that's all"]) 
-        # Fast-path for short questions
         txt_lower = self._buffer_text.strip().lower()
-        question_starters = (
-            "what ", "why ", "how ", "is ", "are ", "can ", "does ", "do ", "did ",
-            "will ", "would ", "should ", "could ", "tell me ", "explain ", "when ", "where ", "which "
-        )
-        starts_like_question = any(txt_lower.startswith(qw) for qw in question_starters)
+        ends_sentence = txt_lower.endswith(SENTENCE_END_CHARS) or \
+                        any(k in txt_lower for k in CLOSING_PHRASES)
+        # Fast-path for short questions
+        starts_like_question = txt_lower.startswith(QUESTION_STARTERS)
         ends_qmark = txt_lower.endswith("?")
         is_short_question = (words <= 8) or starts_like_question or ends_qmark
 
@@ -375,7 +1040,7 @@ class SpeechRecognitionThread(QThread):
             if self._pending_finalize_since == 0.0:
                 self._pending_finalize_since = now
                 # Inform user we're waiting for completion
-                self.listening_status.emit("Waiting for question completion…")
+                self._emit_status("Waiting for question completion…")
                 return
             # Shorter confirmation window for short questions
             confirm_hold = 0.22 if is_short_question else self._confirm_pause_sec
@@ -388,9 +1053,48 @@ class SpeechRecognitionThread(QThread):
             self._buffer_text = ""
             self._utterance_start_ts = 0.0
             self._pending_finalize_since = 0.0
-            if final_text:
-                self.recognized.emit(final_text)
-                self.listening_status.emit("Got it!")
+            if final_text and self._emit_recognized(final_text):
+                self._emit_status("Got it!")
+
+    def _emit_status(self, status):
+        """Only cross into the GUI thread when the status text changes, at most 5 times a second."""
+        with self._status_lock:
+            self._pending_status = None
+            if status == self._last_status:
+                return
+            wait = STATUS_MIN_INTERVAL_SEC - (time.monotonic() - self._last_status_ts)
+            if wait > 0:
+                # trailing edge: hold the newest change and send it when the window closes
+                self._pending_status = status
+                if self._status_timer is None:
+                    self._status_timer = threading.Timer(wait, self._flush_status)
+                    self._status_timer.daemon = True
+                    self._status_timer.start()
+                return
+            self._send_status(status)
+
+    def _flush_status(self):
+        with self._status_lock:
+            self._status_timer = None
+            status, self._pending_status = self._pending_status, None
+            if status is not None and status != self._last_status:
+                self._send_status(status)
+
+    def _send_status(self, status):
+        # caller holds _status_lock
+        self._last_status = status
+        self._last_status_ts = time.monotonic()
+        self.listening_status.emit(status)
+
+    def _emit_recognized(self, text):
+        """Emit a finished question unless it repeats the previous one within a couple of seconds."""
+        now = time.monotonic()
+        norm = " ".join(text.lower().split())
+        if norm == self._last_emitted_text and now - self._last_emitted_ts < DUPLICATE_SUPPRESS_SEC:
+            return False
+        self._last_emitted_text, self._last_emitted_ts = norm, now
+        self.recognized.emit(text)
+        return True
 
     def _merge_transcript(self, existing: str, new_part: str) -> str:
         """Merge ASR segments, removing simple overlaps to improve accuracy."""
@@ -416,21 +1120,68 @@ class SpeechRecognitionThread(QThread):
 
     def stop(self):
         self.running = False
+        with self._status_lock:
+            self._pending_status = None
+            if self._status_timer is not None:
+                self._status_timer.cancel()
+                self._status_timer = None
         # If there's buffered speech, emit it once on stop
         if self._buffer_text:
             final_text = self._buffer_text.strip()
             self._buffer_text = ""
             self._utterance_start_ts = 0.0
             if final_text:
-                self.recognized.emit(final_text)
+                self._emit_recognized(final_text)
+
+
+class AuthWorker(QThread):
+    """Runs /login or /signup off the UI thread."""
+    succeeded = Signal(dict)
+    failed = Signal(str)
+    # Set once an old backend answers /login without credits; later logins then overlap /get_credits
+    _login_lacks_credits = False
+
+    def __init__(self, action, email, password, parent=None):
+        super().__init__(parent)
+        self.action = action
+        self.email = email
+        self.password = password
+
+    def run(self):
+        creds = {"email": self.email, "password": self.password}
+        try:
+            session = _backend_session()
+            if self.action == "signup":
+                j = session.post(f"{BACKEND_URL}/signup", json=creds, timeout=AUTH_TIMEOUT).json()
+            else:
+                # /login answers with credits; older backends need the separate /get_credits call
+                credits_future = None
+                if AuthWorker._login_lacks_credits:
+                    credits_future = _executor.submit(session.post, f"{BACKEND_URL}/get_credits",
+                                                      json=creds, timeout=AUTH_TIMEOUT)
+                j = session.post(f"{BACKEND_URL}/login", json=creds, timeout=AUTH_TIMEOUT).json()
+                if j.get("success") and "credits" not in j:
+                    AuthWorker._login_lacks_credits = True
+                    if credits_future is None:
+                        credits_future = _executor.submit(session.post, f"{BACKEND_URL}/get_credits",
+                                                          json=creds, timeout=AUTH_TIMEOUT)
+                    # A failed login ignores whatever the overlapped credits call returned
+                    j["credits"] = credits_future.result().json().get("credits", 0)
+            self.succeeded.emit(j)
+        except Exception as e:
+            self.failed.emit(f"Error: {e}")
 
 
 class AuthView(QWidget):
     authed = Signal(str, str, int)  # email, password, credits
+    _session_cache = None  # parsed session file, shared by all instances
 
     def __init__(self):
         super().__init__()
-        self.setStyleSheet(glass())
+        self.token = None  # signed token from /login, used instead of the password
+        self.warm_start = False  # True when the main view was opened from a cached token
+        self._worker = None
+        self.setStyleSheet(QSS_GLASS)
         self._build()
 
     def _build(self):
@@ -441,7 +1192,7 @@ class AuthView(QWidget):
         # No header for login UI, just the login box
 
         body = QFrame()
-        body.setStyleSheet(glass_panel("rgba(0,0,0,0.7)"))
+        body.setStyleSheet(QSS_AUTH_BODY)
         body.setFixedSize(340, 200)  # Slightly bigger for better text visibility
         body_layout = QVBoxLayout(body)
         body_layout.setContentsMargins(18, 18, 18, 18)  # More padding for comfort
@@ -449,25 +1200,20 @@ class AuthView(QWidget):
 
         self.email = QLineEdit()
         self.email.setPlaceholderText("Email")
-        self.email.setStyleSheet(input_style())
         self.pw = QLineEdit()
         self.pw.setPlaceholderText("Password")
         self.pw.setEchoMode(QLineEdit.Password)
-        self.pw.setStyleSheet(input_style())
 
         self.status = QLabel("")
         self.status.setStyleSheet("color:#fff; font-style: italic;")
         self.status.setWordWrap(True)
 
         self.btn_login = QPushButton("Login")
-        self.btn_login.setStyleSheet(button_primary())
+        self.btn_login.setStyleSheet(QSS_BUTTON_PRIMARY)
         self.btn_login.clicked.connect(self._login)
 
         self.btn_signup = QPushButton("New user? Sign up")
-        self.btn_signup.setStyleSheet("""
-            QPushButton { background: transparent; color: #4F8CFF; border: none; }
-            QPushButton:hover { text-decoration: underline; }
-        """)
+        self.btn_signup.setStyleSheet(QSS_LINK_BUTTON)
         self.btn_signup.clicked.connect(self._signup)
 
         body_layout.addWidget(self.email)
@@ -486,20 +1232,92 @@ class AuthView(QWidget):
         root.addStretch(1)
 
         # auto-fill from local file if exists
-        self._try_autologin()
+        # After the first paint; the window shouldn't wait on the session file or network
+        QTimer.singleShot(0, self._try_autologin)
 
-    def _try_autologin(self):
-        f = os.path.expanduser("~/.live_insights_session.json")
-        if os.path.exists(f):
+    @classmethod
+    def _load_session(cls):
+        """Parsed session file, read from disk at most once per process."""
+        if cls._session_cache is None:
             try:
-                with open(f, "r") as fp:
-                    d = json.load(fp)
-                if time.time() - d.get("ts", 0) < 7 * 24 * 3600:
-                    self.email.setText(d.get("email", ""))
-                    self.pw.setText(d.get("password", ""))
-                    self._login(auto=True)
+                with open(SESSION_FILE, "r") as fp:
+                    cls._session_cache = json.load(fp)
             except Exception:
-                pass
+                cls._session_cache = {}
+        return cls._session_cache
+
+    @classmethod
+    def _save_session(cls, em, token, exp=0, credits=0):
+        cached = cls._load_session()
+        # Every newly issued token is written; only a repeat of the cached one skips the disk
+        if not token or (cached.get("email") == em and cached.get("token") == token):
+            return
+        cls._write_session({"email": em, "token": token, "exp": exp, "credits": credits})
+
+    @classmethod
+    def _write_session(cls, data):
+        tmp = SESSION_FILE + ".tmp"
+        # Holds a bearer token: create it owner-only (0600) rather than with the umask default
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+        os.replace(tmp, SESSION_FILE)
+        cls._session_cache = data
+
+    @classmethod
+    def _clear_session(cls):
+        cls._session_cache = {}
+        try:
+            os.remove(SESSION_FILE)
+        except Exception:
+            pass
+
+    def _try_autologin(self):
+        d = self._load_session()
+        if "password" in d:
+            # Written by an older version that kept the password; drop it from disk
+            d = {k: v for k, v in d.items() if k != "password"}
+            try:
+                self._write_session(d)
+            except OSError:
+                self._clear_session()
+        if not d.get("email"):
+            return
+        self.email.setText(d["email"])
+        if d.get("token") and d.get("exp", 0) > time.time() + 60:
+            # Token still valid: skip /login; MainView re-checks it in the background
+            self.token = d["token"]
+            self.warm_start = True
+            self.authed.emit(d["email"], "", d.get("credits", 0))
+            return
+        # Token expired: only the password is missing
+        self.pw.setFocus()
+
+    def show_login(self, message=""):
+        """Back from MainView: keep the email, ask for the password again."""
+        self.token = None
+        self.warm_start = False
+        self.pw.clear()
+        self.status.setText(message)
+        self.pw.setFocus()
+
+    def _start_worker(self, action, em, pw, on_success):
+        if self._worker is not None and self._worker.isRunning():
+            return
+        self.btn_login.setEnabled(False)
+        self.btn_signup.setEnabled(False)
+        self._worker = AuthWorker(action, em, pw, parent=self)
+        self._worker.succeeded.connect(lambda j: on_success(j, em, pw))
+        self._worker.failed.connect(self._on_auth_error)
+        self._worker.finished.connect(self._on_worker_finished)
+        self._worker.start()
+
+    def _on_worker_finished(self):
+        self.btn_login.setEnabled(True)
+        self.btn_signup.setEnabled(True)
+
+    def _on_auth_error(self, msg):
+        self.status.setText(msg)
 
     def _login(self, auto=False):
         em = self.email.text().strip()
@@ -508,22 +1326,17 @@ class AuthView(QWidget):
             QMessageBox.warning(self, "Login", "Please enter both email and password.")
             return
         self.status.setText("Logging in...")
-        QApplication.processEvents()
-        try:
-            r = requests.post(f"{BACKEND_URL}/login", json={"email": em, "password": pw}, timeout=8)
-            j = r.json()
-            if j.get("success"):
-                # fetch credits
-                gc = requests.post(f"{BACKEND_URL}/get_credits", json={"email": em, "password": pw}, timeout=8).json()
-                credits = gc.get("credits", 0)
-                # store session for 7 days
-                with open(os.path.expanduser("~/.live_insights_session.json"), "w") as fp:
-                    json.dump({"email": em, "password": pw, "ts": time.time()}, fp)
-                self.authed.emit(em, pw, credits)
-            else:
-                self.status.setText(j.get("message", "Login failed."))
-        except Exception as e:
-            self.status.setText(f"Error: {e}")
+        self._start_worker("login", em, pw, self._on_login_result)
+
+    def _on_login_result(self, j, em, pw):
+        if j.get("success"):
+            self.token = j.get("token")
+            self.warm_start = False
+            # keep email + token until the token expires; the file write happens off the UI thread (errors are ignored)
+            _executor.submit(self._save_session, em, self.token, j.get("exp", 0), j.get("credits", 0))
+            self.authed.emit(em, pw, j.get("credits", 0))
+        else:
+            self.status.setText(j.get("message", "Login failed."))
 
     def _signup(self):
         em = self.email.text().strip()
@@ -532,34 +1345,38 @@ class AuthView(QWidget):
             QMessageBox.warning(self, "Signup", "Please enter both email and password.")
             return
         self.status.setText("Signing up...")
-        QApplication.processEvents()
-        try:
-            r = requests.post(f"{BACKEND_URL}/signup", json={"email": em, "password": pw}, timeout=8)
-            j = r.json()
-            if j.get("success"):
-                QMessageBox.information(self, "Signup", "Account created! Please log in.")
-            else:
-                self.status.setText(j.get("message", "Signup failed."))
-        except Exception as e:
-            self.status.setText(f"Error: {e}")
+        self._start_worker("signup", em, pw, self._on_signup_result)
+
+    def _on_signup_result(self, j, em, pw):
+        if j.get("success"):
+            self.status.setText("")
+            QMessageBox.information(self, "Signup", "Account created! Please log in.")
+        else:
+            self.status.setText(j.get("message", "Signup failed."))
 
 
 class MainView(QWidget):
     # Marshal background-thread updates safely to the UI thread
     ai_update = Signal(dict)
-    request_logout = Signal()
+    request_logout = Signal(str)  # message for the login screen ("" on a plain logout)
 
-    def __init__(self, email, password, credits):
+    def __init__(self, email, password, credits, token=None, verify_token=False):
         super().__init__()
         self.email = email
         self.password = password
+        self.token = token
         self.credits = int(credits or 0)
 
-        self.questions = []
+        self.questions = collections.deque(maxlen=QUESTION_HISTORY_MAX)  # newest first
+        self._question_count = 0  # total asked, so numbering survives the cap
         self.answers = []
+        self._history = []  # completed user/assistant messages, oldest first
         self.ai_response = ""
         self.smart_mode = False
         self.resume_path = None
+        self._resume_file = None  # (filename, bytes, mime) read once at upload
+        self._resume_hash = None  # SHA-1 of those bytes, the backend's resume-text cache key
+        self._resume_hash_sent = None  # hash the backend has already extracted text for
         self.listening = False
         self.opacity = 0.95
         
@@ -574,19 +1391,26 @@ class MainView(QWidget):
         self.is_linux = self.platform == "linux"
 
         self.listener = None  # WhisperThread
+        self._answer_cursor = None  # end of the answer currently being streamed
+        self._ask_seq = 0  # bumped per question; updates from superseded requests are dropped
+        self._rendered_answers = None  # answers the pane currently shows; None once anything else writes to it
         self._drag_pos = None
 
-        self.setStyleSheet(glass())
+        self.setStyleSheet(QSS_MAIN_VIEW)
 
         # Connect background updates to UI-thread slot
         self.ai_update.connect(self._apply_ai_update)
+        if verify_token:
+            # Opened from a cached token without /login; confirm it and refresh credits
+            _executor.submit(self._verify_session_bg)
+
+        # Debounce recognized speech before asking the backend
+        self._pending_speech = []
+        self._speech_timer = QTimer(self)
+        self._speech_timer.setSingleShot(True)
+        self._speech_timer.setInterval(SPEECH_DEBOUNCE_MS)
+        self._speech_timer.timeout.connect(self._flush_pending_speech)
 
-        # Persistent HTTP session for faster requests
-        self._session = requests.Session()
-        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
-        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
         self._build()
         self._install_hotkeys()
 
@@ -601,31 +1425,30 @@ class MainView(QWidget):
         # Header
         header = QFrame()
         header.setObjectName("header")
-        header.setStyleSheet(header_style())
         header.setFixedHeight(40)
         hl = QHBoxLayout(header)
         hl.setContentsMargins(16, 8, 16, 8)
         hl.setSpacing(10)
 
         self.drag_handle = QLabel("💡  Live insights")
-        self.drag_handle.setStyleSheet("font-weight: 700; font-size: 16px;")
+        self.drag_handle.setObjectName("drag_handle")
         self.drag_handle.setToolTip("Click and drag to move window")
         hl.addWidget(self.drag_handle)
 
         self.smart_label = QLabel("Smart mode: OFF")
-        self.smart_label.setStyleSheet("color: #aaa; font-size: 14px;")
+        self.smart_label.setObjectName("smart_label")
         hl.addWidget(self.smart_label)
 
         hl.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
         self.credit_label = QLabel(f"Credits: {self.credits} ")
-        self.credit_label.setStyleSheet("color: #4CAF50; font-weight: 700;")
+        self.credit_label.setObjectName("credit_label")
         hl.addWidget(self.credit_label)
 
     # Removed the close (cross) button from the main header
 
         btn_logout = QPushButton("Logout")
-        btn_logout.setStyleSheet("QPushButton{background: transparent; color: #fff; border: none; font-weight: 600;}")
+        btn_logout.setObjectName("logout_button")
         btn_logout.clicked.connect(self._logout)
         hl.addWidget(btn_logout)
 
@@ -647,26 +1470,29 @@ class MainView(QWidget):
         ll.setSpacing(8)
 
         qh = QLabel("Questions")
-        qh.setStyleSheet("font-weight: 600; font-size: 15px;")
+        qh.setObjectName("section_heading")
         ll.addWidget(qh)
 
-        self.questions_box = QTextEdit()
+        # Plain-text document: no rich-text/HTML layout for what is only ever plain text
+        self.questions_box = QPlainTextEdit()
         self.questions_box.setReadOnly(True)
+        # Read-only log: don't keep undo commands for every insert
+        self.questions_box.setUndoRedoEnabled(False)
         self.questions_box.setWordWrapMode(QTextOption.WordWrap)
-        self.questions_box.setStyleSheet(textedit_style())
+        self.questions_box.setStyleSheet(QSS_TEXTEDIT)
         ll.addWidget(self.questions_box, 1)
 
         # Listening controls
         listen_controls = QHBoxLayout()
         
         self.btn_listen = QPushButton("🎤 Start Listening")
-        self.btn_listen.setStyleSheet(button_primary())
+        self.btn_listen.setStyleSheet(QSS_BUTTON_PRIMARY)
         self.btn_listen.clicked.connect(self._toggle_listening)
         listen_controls.addWidget(self.btn_listen)
         
         # Add microphone status indicator
         self.mic_status = QLabel("🎤 Microphone: Ready")
-        self.mic_status.setStyleSheet("color:#4CAF50; font-size:12px; font-weight:600;")
+        self.mic_status.setStyleSheet(QSS_STATUS_SMALL_OK)
         listen_controls.addWidget(self.mic_status)
         
         ll.addLayout(listen_controls)
@@ -678,7 +1504,7 @@ class MainView(QWidget):
         # Remove manual input section - keeping it simple
 
         self.resume_status = QLabel("")
-        self.resume_status.setStyleSheet("color:#4CAF50; font-weight:600;")
+        self.resume_status.setStyleSheet(QSS_STATUS_OK)
         ll.addWidget(self.resume_status)
 
         # Platform-specific hotkey tips
@@ -701,7 +1527,7 @@ class MainView(QWidget):
             "💡 Smart Mode: Uses resume context for personalized answers\n"
             f" 🖥️ Platform: {self.platform.title()}"
         )
-        tips.setStyleSheet("color:#aaa; font-size: 10px; line-height: 1.2; padding: 4px;")
+        tips.setObjectName("tips_label")
         ll.addWidget(tips)
 
         # Right (Answers)
@@ -712,39 +1538,16 @@ class MainView(QWidget):
         rl.setSpacing(8)
 
         ah = QLabel("Answers")
-        ah.setStyleSheet("font-weight: 600; font-size: 15px;")
+        ah.setObjectName("section_heading")
         rl.addWidget(ah)
 
-        self.answers_box = QTextEdit()
+        self.answers_box = QPlainTextEdit()
         self.answers_box.setReadOnly(True)
+        self.answers_box.setUndoRedoEnabled(False)
+        self.answers_box.setMaximumBlockCount(ANSWER_MAX_BLOCKS)
         self.answers_box.setWordWrapMode(QTextOption.WordWrap)
         # Special interview-friendly styling for answers
-        self.answers_box.setStyleSheet("""
-            QTextEdit {
-                background: rgba(40,40,40,0.95);
-                border: none;
-                border-radius: 10px;
-                color: #fff;
-                padding: 16px;
-                line-height: 1.8;
-                font-size: 15px;
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-weight: 500;
-            }
-            QScrollBar:vertical {
-                background: rgba(255,255,255,0.1);
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(255,255,255,0.3);
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(255,255,255,0.5);
-            }
-        """)
+        self.answers_box.setStyleSheet(QSS_ANSWERS_BOX)
         rl.addWidget(self.answers_box, 1)
 
         cl.addWidget(left, 1)
@@ -755,15 +1558,7 @@ class MainView(QWidget):
         # Add resize handle in bottom-right corner
         self.resize_handle = QFrame()
         self.resize_handle.setFixedSize(20, 20)
-        self.resize_handle.setStyleSheet("""
-                    QFrame {
-            background-color: rgba(255,255,255,0.2);
-            border-radius: 10px;
-        }
-        QFrame:hover {
-            background-color: rgba(255,255,255,0.4);
-        }
-        """)
+        self.resize_handle.setStyleSheet(QSS_RESIZE_HANDLE)
         self.resize_handle.mousePressEvent = self._start_resize
         self.resize_handle.mouseMoveEvent = self._resize_window
         
@@ -788,21 +1583,6 @@ class MainView(QWidget):
         else:
             e.ignore()
     
-    def mouseReleaseEvent(self, e):
-        """Handle mouse release for both dragging and resizing"""
-        # Handle dragging
-        if self._drag_pos is not None:
-            self._drag_pos = None
-            self.setCursor(Qt.ArrowCursor)
-        
-        # Handle resizing
-        if hasattr(self, '_resize_start_pos'):
-            delattr(self, '_resize_start_pos')
-            delattr(self, '_resize_start_size')
-            self.setCursor(Qt.ArrowCursor)
-        
-        e.accept()
-    
     def mouseDoubleClickEvent(self, e):
         """Double-click to toggle window size between default and full screen"""
         if e.button() == Qt.LeftButton:
@@ -882,17 +1662,24 @@ class MainView(QWidget):
             self.listen_status.setText("Window shown.")
 
     def _logout(self):
-        # mirror React: clear local + call /logout
-        try:
-            requests.post(f"{BACKEND_URL}/logout", timeout=3)
-        except Exception:
-            pass
+        self._end_session("")
+
+    def _end_session(self, message):
+        # mirror React: clear local + call /logout (fire-and-forget; the UI doesn't wait on it)
+        _executor.submit(_backend_session().post, f"{BACKEND_URL}/logout", timeout=3)
         # delete session file
-        try:
-            os.remove(os.path.expanduser("~/.live_insights_session.json"))
-        except Exception:
-            pass
-        self.request_logout.emit()
+        AuthView._clear_session()
+        # the view is discarded on logout: stop the mic thread and free the widget tree.
+        # The listener is parented to this view, so deletion waits until its run() returns.
+        self.listening = False
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.finished.connect(self.deleteLater)
+            listener.stop()
+            listener.quit()
+        if listener is None or not listener.isRunning():
+            self.deleteLater()
+        self.request_logout.emit(message)
 
     def _install_hotkeys(self):
         """Install platform-specific hotkeys with error handling"""
@@ -978,8 +1765,15 @@ class MainView(QWidget):
             self.smart_mode = False
         else:
             self.smart_mode = not self.smart_mode
+        self._update_smart_label()
+
+    def _update_smart_label(self):
+        # Colour comes from the #smart_label[on="true"] rule; re-polish instead of a new stylesheet
         self.smart_label.setText(f"Smart mode: {'ON' if self.smart_mode else 'OFF'}")
-        self.smart_label.setStyleSheet(f"color: {'#4CAF50' if self.smart_mode else '#aaa'}; font-size:14px;")
+        self.smart_label.setProperty("on", self.smart_mode)
+        style = self.smart_label.style()
+        style.unpolish(self.smart_label)
+        style.polish(self.smart_label)
 
     def _upload_resume(self):
         path, _ = QFileDialog.getOpenFileName(
@@ -992,59 +1786,67 @@ class MainView(QWidget):
             return
             
         # Check file size (limit to 10MB)
-        file_size = os.path.getsize(path) / (1024 * 1024)  # Convert to MB
+        file_size = os.stat(path).st_size / (1024 * 1024)  # Convert to MB
         if file_size > 10:
             QMessageBox.warning(self, "File Too Large", "Please select a file smaller than 10MB.")
             return
             
         # Show processing status
         self.resume_status.setText("🔄 Processing resume...")
-        self.resume_status.setStyleSheet("color:#FFA500; font-weight:600;")
-        QApplication.processEvents()
+        _set_style(self.resume_status, QSS_STATUS_BUSY)
+        # Paint just this label before the read; draining the whole event queue here re-enters handlers
+        self.resume_status.repaint()
         
         try:
-            # Try to read a preview of the resume content
-            resume_preview = self._get_resume_preview(path)
+            # Read once; the same bytes are previewed here and uploaded with every Smart question
+            with open(path, "rb") as f:
+                data = f.read()
+            resume_preview = self._get_resume_preview(path, data)
             if resume_preview:
                 self.resume_path = path
                 filename = os.path.basename(path)
+                mime = "application/pdf" if path.lower().endswith(".pdf") else "text/plain"
+                self._resume_file = (filename, data, mime)
+                self._resume_hash = hashlib.sha1(data).hexdigest()
+                self._resume_hash_sent = None
                 self.resume_status.setText(f"✅ Resume loaded: {filename}\n📄 Content preview: {resume_preview[:100]}...")
-                self.resume_status.setStyleSheet("color:#4CAF50; font-weight:600; font-size:12px;")
+                _set_style(self.resume_status, QSS_STATUS_SMALL_OK)
                 
                 # Auto-enable smart mode if resume is loaded
                 if not self.smart_mode:
                     self.smart_mode = True
-                    self.smart_label.setText("Smart mode: ON")
-                    self.smart_label.setStyleSheet("color: #4CAF50; font-size:14px;")
+                    self._update_smart_label()
             else:
                 self.resume_status.setText("❌ Could not read resume content")
-                self.resume_status.setStyleSheet("color:#f44336; font-weight:600;")
+                _set_style(self.resume_status, QSS_STATUS_ERROR)
                 
         except Exception as e:
             self.resume_status.setText(f"❌ Error processing resume: {str(e)}")
-            self.resume_status.setStyleSheet("color:#f44336; font-weight:600;")
+            _set_style(self.resume_status, QSS_STATUS_ERROR)
 
-    def _get_resume_preview(self, file_path):
+    def _get_resume_preview(self, file_path, data):
         """Get a preview of resume content for validation"""
         try:
             if file_path.lower().endswith('.pdf'):
-                # For PDFs, we'll just check if the file can be opened
-                # The actual text extraction will be done by the backend
+                # Renamed non-PDFs are rejected here instead of failing extraction on every question;
+                # the actual text extraction will be done by the backend
+                if not data.startswith(b"%PDF"):
+                    return None
                 return "PDF file detected - content will be extracted by backend"
             else:
-                # For text files, read a preview
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if len(content.strip()) > 0:
-                        return content.strip()
-                    else:
-                        return None
+                # For text files, preview the bytes already read; only the head is ever shown
+                # isspace() and a bounded slice: stripping the whole buffer copies up to 10 MB
+                if not data or data.isspace():
+                    return None
+                head = data[:4 * RESUME_PREVIEW_BYTES].lstrip()[:RESUME_PREVIEW_BYTES]
+                return head.decode('utf-8', errors='ignore').strip() or None
         except Exception as e:
             return None
     
     def _clear_answers(self):
         self.answers = []
         self.answers_box.clear()
+        self._rendered_answers = None
     
     def _test_hotkey(self):
         """Test method to verify hotkeys are working"""
@@ -1061,10 +1863,10 @@ class MainView(QWidget):
             # Stop listening
             self.listening = False
             self.btn_listen.setText("🎤 Start Listening")
-            self.btn_listen.setStyleSheet(button_primary())
+            _set_style(self.btn_listen, QSS_BUTTON_PRIMARY)
             self.listen_status.setText("Stopped listening.")
             self.mic_status.setText("🎤 Microphone: Ready")
-            self.mic_status.setStyleSheet("color:#4CAF50; font-size:12px; font-weight:600;")
+            _set_style(self.mic_status, QSS_STATUS_SMALL_OK)
             if self.listener:
                 self.listener.stop()
                 self.listener.quit()
@@ -1073,48 +1875,33 @@ class MainView(QWidget):
             # Start listening
             self.listening = True
             self.btn_listen.setText("⏹️ Stop Listening")
-            self.btn_listen.setStyleSheet("""
-                QPushButton {
-                    background: rgba(239,68,68,0.9);
-                    color: white;
-                    font-weight: 700;
-                    border: none;
-                    border-radius: 24px;
-                    padding: 10px 16px;
-                }
-                QPushButton:hover {
-                    background: rgba(239,68,68,1);
-                }
-                QPushButton:disabled {
-                    background: #2b2b2b;
-                    color: #888;
-                }
-            """)
+            _set_style(self.btn_listen, QSS_BUTTON_STOP)
             self.listen_status.setText("Starting...")
             self.mic_status.setText("🎤 Microphone: Starting...")
-            self.mic_status.setStyleSheet("color:#FFA500; font-size:12px; font-weight:600;")
+            _set_style(self.mic_status, QSS_STATUS_SMALL_BUSY)
             
             # Create and start speech recognition thread
             try:
                 self.listener = SpeechRecognitionThread(language="en-US", parent=self)
                 self.listener.recognized.connect(self._on_speech)
+                self.listener.partial.connect(self._on_partial_speech)
                 self.listener.error.connect(self._on_listen_error)
-                self.listener.listening_status.connect(self._on_listening_status)
+                self.listener.listening_status.connect(self._on_listening_status, Qt.QueuedConnection)
                 self.listener.start()
             except Exception as e:
                 self.listen_status.setText(f"Failed to start: {str(e)}")
                 self.mic_status.setText("🎤 Microphone: Error ❌")
-                self.mic_status.setStyleSheet("color:#f44336; font-size:12px; font-weight:600;")
+                _set_style(self.mic_status, QSS_STATUS_SMALL_ERROR)
                 self.listening = False
                 self.btn_listen.setText("🎤 Start Listening")
-                self.btn_listen.setStyleSheet(button_primary())
+                _set_style(self.btn_listen, QSS_BUTTON_PRIMARY)
 
     def _on_listen_error(self, msg):
         self.listen_status.setText(f"Error: {msg}")
         self.listening = False
         self.btn_listen.setEnabled(True)
         self.btn_listen.setText("🎤 Start Listening")
-        self.btn_listen.setStyleSheet(button_primary())
+        _set_style(self.btn_listen, QSS_BUTTON_PRIMARY)
         if self.listener:
             self.listener.stop()
             self.listener.quit()
@@ -1123,17 +1910,31 @@ class MainView(QWidget):
     def _on_listening_status(self, status):
         self.listen_status.setText(status)
 
+    def _on_partial_speech(self, text):
+        # Interim words while the question is still being asked; the final text arrives via _on_speech
+        self.listen_status.setText(f"🗣️ {text}")
+
     def _on_speech(self, text):
         # Accept ALL speech - no filtering or validation
         if not text or len(text.strip()) < 1:  # Only check if text exists
             return
-        
+        # Fragments arriving back-to-back become one question / one backend call
+        self._pending_speech.append(text.strip())
+        self._speech_timer.start()
+
+    def _flush_pending_speech(self):
+        text = " ".join(self._pending_speech)
+        self._pending_speech.clear()
+        if not text:
+            return
+
         # Add the question to the list
-        self.questions.insert(0, text.strip())
-        self._render_questions()
+        self._question_count += 1
+        self.questions.appendleft(text.strip())
+        self._prepend_question(text.strip())
         
-        # Clear answers - thinking will be shown by _ask_ai
-        self.answers_box.clear()
+        # Previous answer is replaced by the thinking indicator in _ask_ai
+        self._rendered_answers = None
         
         # Send to AI immediately
         self._ask_ai(text.strip())
@@ -1143,24 +1944,30 @@ class MainView(QWidget):
             # The speech recognition thread will continue automatically
             self.listen_status.setText("Listening for next question...")
 
-    def _render_questions(self):
-        # newest first (matching your scroll-to-top in React)
-        self.questions_box.clear()
-        for i, q in enumerate(self.questions):
-            # Format questions in a clean, interview-friendly way
-            formatted_question = f"Q{i+1}: {q.strip()}"
-            self.questions_box.append(formatted_question)
-        
-        # Auto-scroll to the latest question
-        if self.questions:
-            self.questions_box.verticalScrollBar().setValue(0)
+    def _prepend_question(self, question):
+        """Insert just the newest question at the top instead of re-rendering the whole list."""
+        doc = self.questions_box.document()
+        line = f"Q{self._question_count}: {question}"
+        cursor = QTextCursor(doc)
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(line if doc.isEmpty() else line + "\n")
+        if doc.blockCount() > QUESTION_HISTORY_MAX:
+            # Oldest question is the last line; drop it together with the break before it
+            cursor.movePosition(QTextCursor.End)
+            cursor.movePosition(QTextCursor.StartOfBlock, QTextCursor.KeepAnchor)
+            cursor.movePosition(QTextCursor.PreviousCharacter, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        self.questions_box.verticalScrollBar().setValue(0)
 
     def _render_answers(self):
-        self.answers_box.clear()
-        for i, a in enumerate(self.answers):
-            # Format answer in a systematic, interview-friendly way
-            formatted_answer = self._format_answer_for_interview(a, i+1)
-            self.answers_box.append(formatted_answer)
+        # Pane already shows exactly these answers (e.g. a repeated blocked/cached reply)
+        rendered = tuple(self.answers)
+        if rendered == self._rendered_answers:
+            return
+        self._rendered_answers = rendered
+        # Format answers in a systematic, interview-friendly way; one layout pass for all of them
+        self.answers_box.setPlainText("\n".join(
+            self._format_answer_for_interview(a, i + 1) for i, a in enumerate(self.answers)))
         
         # Auto-scroll to the latest answer for easy reading
         if self.answers:
@@ -1168,274 +1975,342 @@ class MainView(QWidget):
 
     def _format_answer_for_interview(self, answer, answer_number):
         """Format AI response in a systematic, interview-friendly way"""
-        if not answer or answer.strip() == "":
-            return ""
-            
-        # Clean up the answer
-        answer = answer.strip()
-        
-        # Check if it's an error message
-        if any(error_indicator in answer.lower() for error_indicator in ["❌", "⏰", "🔌", "error", "timeout", "connection"]):
-            return f"A{answer_number}: {answer}"
-        
-        # Format systematic responses
-        formatted = f"A{answer_number}: "
-        
-        # Split into paragraphs
-        paragraphs = answer.split('\n\n')
-        
-        for i, paragraph in enumerate(paragraphs):
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-                
-            # If paragraph starts with common interview response patterns, format them
-            if any(pattern in paragraph.lower()[:50] for pattern in [
-                "based on", "in my experience", "i would", "my approach", 
-                "the key", "first", "second", "third", "finally",
-                "here's how", "let me", "i believe", "my strategy"
-            ]):
-                # Format as structured response
-                formatted += self._structure_paragraph(paragraph)
-            else:
-                # Regular paragraph
-                formatted += paragraph
-                
-            # Add spacing between paragraphs
-            if i < len(paragraphs) - 1:
-                formatted += "\n\n"
-        
-        return formatted
+        return _format_answer(answer, answer_number)
 
     def _structure_paragraph(self, paragraph):
         """Structure a paragraph for better readability"""
-        # Look for numbered or bullet points
-        lines = paragraph.split('\n')
-        structured = ""
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check for numbered lists (1., 2., etc.)
-            if re.match(r'^\d+\.', line):
-                structured += f"• {line[line.find('.')+1:].strip()}\n"
-            # Check for bullet points
-            elif line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                structured += f"• {line[1:].strip()}\n"
-            # Check for key phrases that should be highlighted
-            elif any(keyword in line.lower() for keyword in [
-                "key", "important", "critical", "essential", "main", "primary"
-            ]):
-                structured += f"🔑 {line}\n"
-            # Check for action items
-            elif any(action in line.lower() for action in [
-                "would", "will", "should", "could", "might"
-            ]):
-                structured += f"→ {line}\n"
-            else:
-                structured += f"{line}\n"
-        
-        return structured.strip()
+        return _structure_paragraph(paragraph)
 
     def _render_ai_response(self):
         if self.ai_response:
-            self.answers_box.append(self.ai_response)
+            self.answers_box.appendPlainText(self.ai_response)
+            self._rendered_answers = None
 
     def _conversation_history(self, max_messages=6):
-        # Interleave as in React; limit to recent to shrink payload
-        hist = []
-        q_rev = list(reversed(self.questions))[:max_messages]
-        a_rev = list(reversed(self.answers))[:max_messages]
-        for i in range(max(len(q_rev), len(a_rev))):
-            if i < len(q_rev):
-                hist.append({"role": "user", "content": q_rev[i]})
-            if i < len(a_rev):
-                hist.append({"role": "assistant", "content": a_rev[i]})
-        return hist
+        # Most recent completed exchanges, oldest first; limit to shrink payload
+        return self._history[-max_messages:]
+
+    def _record_turn(self, question, answer):
+        """Append one completed exchange; only the last HISTORY_MAX_MESSAGES are kept."""
+        self._history.append({"role": "user", "content": question})
+        self._history.append({"role": "assistant", "content": answer})
+        del self._history[:-HISTORY_MAX_MESSAGES]
 
     def _ask_ai(self, question):
-        # mirrors askAI in React
+        # mirrors askAI in React; any request still in flight is superseded from here on
+        self._ask_seq += 1
         if self.credits <= 0:
             self.ai_response = "❌ No credits left. Please purchase more credits."
             self._render_answers()
             self._render_ai_response()
             return
             
-        # Show thinking indicator
-        self.ai_response = "🤔 Processing..."
-        self._render_ai_response()
-        QApplication.processEvents()  # Update UI immediately
-        
-        # offload network request to background to keep listening continuous
-        _executor.submit(self._process_ai_request, question)
+        # Show thinking indicator: one document replace, no formatting pass
+        self._answer_cursor = None
+        self.answers_box.setPlainText(THINKING_TEXT)
+
+        # offload network request to background; the indicator paints as soon as we return
+        _executor.submit(self._process_ai_request, question, self._ask_seq)
+
+    def _process_ai_request(self, question, seq):
+        import requests  # already loaded by _backend_session; named for the except clauses below
+
+        def emit(update):
+            # Tag with the question it answers so a newer question's pane isn't overwritten
+            update["seq"] = seq
+            self.ai_update.emit(update)
 
-    def _process_ai_request(self, question):
         # prepare request (smart vs global)
         try:
             if self.smart_mode and self.resume_path:
-                # smart: multipart with file
-                files = {
-                    "resume": (os.path.basename(self.resume_path), open(self.resume_path, "rb"),
-                               "application/pdf" if self.resume_path.lower().endswith(".pdf") else "text/plain")
-                }
+                # smart: multipart with the resume bytes cached at upload (no disk read, no leaked handle)
                 data = {
                     "question": question,
                     "email": self.email,
                     "mode": "resume",
                     "history": json.dumps(self._conversation_history())
                 }
+                if self._resume_hash_sent == self._resume_hash:
+                    # Backend already has this resume's text; send only its hash (still multipart)
+                    files = {"resume_hash": (None, self._resume_hash)}
+                else:
+                    files = {"resume": self._resume_file}
                 # Inform UI from background via signal
-                self.ai_update.emit({"listen_status": "🤖 Sending to AI (Smart Mode - Using Resume Context)..."})
+                emit({"listen_status": "🤖 Sending to AI (Smart Mode - Using Resume Context)..."})
                 # Faster, persistent session with moderate timeout
-                r = self._session.post(f"{BACKEND_URL}/ask", files=files, data=data, timeout=35)
-                j = r.json()
-                ans = j.get("answer") or "No response from AI."
+                ans = self._stream_answer(seq, files=files, data=data, timeout=35)
+                if ans is None:
+                    return
+                ans = ans or "No response from AI."
                 
                 # Check if answer was blocked due to template detection
                 if "[Error: The answer was blocked" in ans:
-                    self.ai_update.emit({
+                    emit({
                         "answers": [f"❌ {ans}"],
                         "ai_response": "",
                         "listen_status": "Answer blocked - please rephrase your question"
                     })
                 elif "Could not extract any text" in ans:
-                    self.ai_update.emit({
+                    emit({
                         "answers": [f"❌ {ans}"],
                         "ai_response": "",
                         "smart_mode": False,
-                        "smart_label_text": "Smart mode: OFF",
-                        "smart_label_style": "color: #aaa; font-size:14px;",
                         "resume_status_text": "❌ Resume text extraction failed",
-                        "resume_status_style": "color:#f44336; font-weight:600;"
+                        "resume_status_style": QSS_STATUS_ERROR
+                    })
+                elif ans.startswith("[Error:"):
+                    # Backend/HTTP error: shown, but not a turn to remember or a credit to charge
+                    emit({
+                        "answers": [f"❌ {ans}"],
+                        "ai_response": "",
+                        "listen_status": "AI request failed"
                     })
                 else:
                     # Success - answer based on resume context
-                    self.ai_update.emit({
+                    self._resume_hash_sent = self._resume_hash
+                    emit({
                         "answers": [ans],
                         "ai_response": "",
-                        "listen_status": "✅ Resume-based answer received!"
+                        "listen_status": "✅ Resume-based answer received!",
+                        "history_turn": (question, ans)
                     })
-                    # Deduct credit only for genuine answers in background
-                    _executor.submit(self._deduct_credit_for_genuine_answer_bg)
             else:
                 # Global mode
-                self.ai_update.emit({"listen_status": "🌐 Sending to AI (Global Mode - General Interview Advice)..."})
-                r = self._session.post(f"{BACKEND_URL}/ask",
-                                  json={
-                                      "question": question,
-                                      "email": self.email,
-                                      "resume": "",
-                                      "mode": "global",
-                                      "history": self._conversation_history(max_messages=6)
-                                  }, timeout=20)
-                j = r.json()
-                ans = j.get("answer") or "No response from AI."
+                emit({"listen_status": "🌐 Sending to AI (Global Mode - General Interview Advice)..."})
+                ans = self._stream_answer(seq, json={
+                    "question": question,
+                    "email": self.email,
+                    "resume": "",
+                    "mode": "global",
+                    "history": self._conversation_history(max_messages=6)
+                }, timeout=20)
+                if ans is None:
+                    return
+                ans = ans or "No response from AI."
                 
                 if "[Error: The answer was blocked" in ans:
-                    self.ai_update.emit({
+                    emit({
                         "answers": [f"❌ {ans}"],
                         "ai_response": "",
                         "listen_status": "Answer blocked - please rephrase your question"
                     })
+                elif ans.startswith("[Error:"):
+                    emit({
+                        "answers": [f"❌ {ans}"],
+                        "ai_response": "",
+                        "listen_status": "AI request failed"
+                    })
                 else:
-                    self.ai_update.emit({
+                    emit({
                         "answers": [ans],
                         "ai_response": "",
-                        "listen_status": "✅ General interview advice received!"
+                        "listen_status": "✅ General interview advice received!",
+                        "history_turn": (question, ans)
                     })
-                    _executor.submit(self._deduct_credit_for_genuine_answer_bg)
                 
-            self.ai_update.emit({"listen_status": "Response received!"})
+            emit({"listen_status": "Response received!"})
             
         except requests.exceptions.Timeout:
-            self.ai_update.emit({
+            emit({
                 "answers": ["⏰ Request timed out. Please try again."],
                 "ai_response": "",
                 "listen_status": "Timeout error"
             })
         except requests.exceptions.ConnectionError:
-            self.ai_update.emit({
+            emit({
                 "answers": ["🔌 Connection error. Please check if the backend server is running."],
                 "ai_response": "",
                 "listen_status": "Connection error"
             })
         except Exception as e:
-            self.ai_update.emit({
+            emit({
                 "answers": [f"❌ Error: {str(e)}"],
                 "ai_response": "",
                 "listen_status": "Error occurred"
             })
 
+    def _stream_answer(self, seq, **kwargs):
+        """POST to /ask_stream, forwarding deltas to the UI as they arrive; returns the final answer.
+
+        Returns None if a newer question superseded this one mid-stream.
+        """
+        with _backend_session().post(f"{BACKEND_URL}/ask_stream", stream=True, **kwargs) as r:
+            if not r.headers.get("Content-Type", "").startswith("text/event-stream"):
+                # Errors (e.g. no credits) come back as a plain JSON {"answer": ...}
+                j = r.json()
+                if j.get("resume_required") and self._resume_file is not None:
+                    # Backend no longer has text for the hash we sent; upload the file with the question again
+                    self._resume_hash_sent = None
+                    kwargs["files"] = {"resume": self._resume_file}
+                    return self._stream_answer(seq, **kwargs)
+                answer = j.get("answer", "")
+                if not r.ok:
+                    # Same shape as the backend's own "[Error: ...]" answers, so callers show it
+                    # but neither record it in history nor charge a credit for it
+                    return f"[Error: {answer or f'HTTP {r.status_code}'}]"
+                return answer
+            r.encoding = "utf-8"
+            answer = ""
+            # chunk_size=None yields bytes as they arrive instead of waiting for 512-byte reads
+            for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                if seq != self._ask_seq:
+                    # Closing the response here also stops the backend generating the rest
+                    return None
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                if "delta" in event:
+                    self.ai_update.emit({"answer_delta": event["delta"], "seq": seq})
+                elif event.get("done"):
+                    answer = event.get("answer", "")
+            return answer
+
+    def _append_answer_delta(self, delta):
+        """Append one streamed chunk at the end of the in-progress answer."""
+        if self._answer_cursor is None:
+            # First chunk overwrites the thinking indicator in a single edit
+            self._rendered_answers = None
+            self._answer_cursor = QTextCursor(self.answers_box.document())
+            self._answer_cursor.select(QTextCursor.Document)
+            self._answer_cursor.insertText("A1: ")
+        self._answer_cursor.movePosition(QTextCursor.End)
+        self._answer_cursor.insertText(delta)
+
     def _apply_ai_update(self, data):
         """Apply updates coming from background threads on the UI thread."""
         if not isinstance(data, dict):
             return
+        if data.get("seq", self._ask_seq) != self._ask_seq:
+            # Reply to an earlier question; a newer one owns the answers pane now
+            if "history_turn" in data:
+                self._record_turn(*data["history_turn"])
+                self._count_genuine_answer()
+            return
         if "listen_status" in data:
             self.listen_status.setText(data["listen_status"])
         if "ai_response" in data:
             self.ai_response = data["ai_response"]
+        if "history_turn" in data:
+            # only genuine answers carry a history turn, so this is also where they're charged
+            self._record_turn(*data["history_turn"])
+            self._count_genuine_answer()
+        if "answer_delta" in data:
+            self._append_answer_delta(data["answer_delta"])
         if "answers" in data:
+            # Final (possibly filtered) answer replaces the streamed text, formatted
             self.answers = data["answers"]
-            self._render_answers()
+            if self._answer_cursor is not None and len(self.answers) == 1 and \
+                    self.answers_box.toPlainText() == _format_answer(self.answers[0], 1):
+                # Plain answer: the streamed document already reads exactly like this, so keep
+                # its layout instead of rebuilding the whole pane
+                self._rendered_answers = tuple(self.answers)
+                self.answers_box.verticalScrollBar().setValue(0)
+            else:
+                self._render_answers()
+            self._answer_cursor = None
         if "smart_mode" in data:
             self.smart_mode = bool(data["smart_mode"]) 
-        if "smart_label_text" in data:
-            self.smart_label.setText(data["smart_label_text"]) 
-        if "smart_label_style" in data:
-            self.smart_label.setStyleSheet(data["smart_label_style"]) 
+            self._update_smart_label()
         if "resume_status_text" in data:
             self.resume_status.setText(data["resume_status_text"]) 
         if "resume_status_style" in data:
-            self.resume_status.setStyleSheet(data["resume_status_style"]) 
+            _set_style(self.resume_status, data["resume_status_style"])
         if "credits" in data:
             self.credits = int(data["credits"]) 
         if "credit_label_text" in data:
             self.credit_label.setText(data["credit_label_text"]) 
-        if "answers_since_last_credit" in data:
-            self.answers_since_last_credit = int(data["answers_since_last_credit"]) 
-
-    def _deduct_credit_for_genuine_answer_bg(self):
-        """Background-safe credit deduction; emits UI updates instead of touching widgets."""
-        # increment locally and prepare UI update for progress
-        new_count = self.answers_since_last_credit + 1
-        if new_count < 2:
-            self.ai_update.emit({
-                "answers_since_last_credit": new_count,
-                "credit_label_text": f"Credits: {self.credits} ({2 - new_count} more answer(s) for next credit)"
-            })
+        if "token" in data:
+            self.token = data["token"]
+        if data.get("session_expired"):
+            self._end_session("Session expired. Please log in again.")
+
+    def _auth_payload(self):
+        """Credentials for credit endpoints; prefer the signed token over the password."""
+        if self.token:
+            return {"email": self.email, "token": self.token}
+        return {"email": self.email, "password": self.password}
+
+    def _verify_session_bg(self):
+        """Check a cached token via /get_credits; on 401 send the user back to the login screen."""
+        try:
+            r = _backend_session().post(f"{BACKEND_URL}/get_credits", json=self._auth_payload(), timeout=8)
+            if r.status_code == 401:
+                # e.g. revoked, or the backend's SECRET_KEY changed
+                self.ai_update.emit({"session_expired": True})
+                return
+            credits = r.json().get("credits", 0)
+        except Exception:
+            return  # backend unreachable; the next request reports it
+        self.ai_update.emit({
+            "credits": credits,
+            "credit_label_text": f"Credits: {credits} (1 credit for 2 answers)"
+        })
+
+    def _refresh_token_bg(self):
+        """New token via /login with the password typed this run (never one from disk); None on failure."""
+        if not self.password:
+            return None  # warm start: there is no password to re-login with
+        try:
+            j = _backend_session().post(f"{BACKEND_URL}/login", json={"email": self.email, "password": self.password},
+                                        timeout=AUTH_TIMEOUT).json()
+        except Exception:
+            return None
+        token = j.get("token") if j.get("success") else None
+        if token:
+            AuthView._save_session(self.email, token, j.get("exp", 0), j.get("credits", 0))
+            self.ai_update.emit({"token": token})
+        return token
+
+    def _count_genuine_answer(self):
+        """UI thread: count a genuine answer; every second one shows the deduction and charges it."""
+        self.answers_since_last_credit += 1
+        if self.answers_since_last_credit < 2:
+            self.credit_label.setText(
+                f"Credits: {self.credits} ({2 - self.answers_since_last_credit} more answer(s) for next credit)")
             return
+        # Reached 2 answers: show the deduction now; the backend's count from _use_credit_bg replaces it
+        self.answers_since_last_credit = 0
+        self.credits = max(0, self.credits - 1)
+        self.credit_label.setText(f"Credits: {self.credits} (1 credit for 2 answers)")
+        _executor.submit(self._use_credit_bg)
 
-        # Reached 2 answers: attempt to deduct on backend
+    def _use_credit_bg(self):
+        """Background /use_credit call; emits the backend's credit count instead of touching widgets."""
         try:
-            r = requests.post(f"{BACKEND_URL}/use_credit",
-                              json={"email": self.email, "password": self.password},
-                              timeout=8)
+            r = _backend_session().post(f"{BACKEND_URL}/use_credit",
+                                        json=self._auth_payload(),
+                                        timeout=8)
+            if r.status_code == 401:
+                # Token no longer accepted: re-login and charge these answers with the new token
+                token = self._refresh_token_bg()
+                if token is None:
+                    self.ai_update.emit({"session_expired": True})
+                    return
+                r = _backend_session().post(f"{BACKEND_URL}/use_credit",
+                                            json={"email": self.email, "token": token},
+                                            timeout=8)
             j = r.json()
             if j.get("success") and isinstance(j.get("credits"), int):
                 new_credits = j["credits"]
             else:
-                gc = requests.post(f"{BACKEND_URL}/get_credits",
-                                   json={"email": self.email, "password": self.password},
-                                   timeout=8).json()
+                gc = _backend_session().post(f"{BACKEND_URL}/get_credits",
+                                             json=self._auth_payload(),
+                                             timeout=8).json()
                 new_credits = gc.get("credits", 0)
             # Emit UI updates
             self.ai_update.emit({
                 "credits": new_credits,
-                "credit_label_text": f"Credits: {new_credits} (1 credit for 2 answers)",
-                "answers_since_last_credit": 0
+                "credit_label_text": f"Credits: {new_credits} (1 credit for 2 answers)"
             })
         except Exception:
             try:
-                gc = requests.post(f"{BACKEND_URL}/get_credits",
-                                   json={"email": self.email, "password": self.password},
-                                   timeout=8).json()
+                gc = _backend_session().post(f"{BACKEND_URL}/get_credits",
+                                             json=self._auth_payload(),
+                                             timeout=8).json()
                 new_credits = gc.get("credits", 0)
                 self.ai_update.emit({
                     "credits": new_credits,
-                    "credit_label_text": f"Credits: {new_credits} (1 credit for 2 answers)",
-                    "answers_since_last_credit": 0
+                    "credit_label_text": f"Credits: {new_credits} (1 credit for 2 answers)"
                 })
             except Exception:
                 self.ai_update.emit({
@@ -1444,7 +2319,7 @@ class MainView(QWidget):
 
     def _deduct_credit(self):
         """Legacy method - kept for compatibility"""
-        _executor.submit(self._deduct_credit_for_genuine_answer_bg)
+        self._count_genuine_answer()
 
 
 
@@ -1460,27 +2335,20 @@ class MainWindow(QWidget):
         self.is_macos = self.platform == "darwin"
         self.is_linux = self.platform == "linux"
         
-        # Frameless but allows free movement and resizing
-        if self.is_windows:
-            # Windows: Full frameless with transparency
-            self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-            self.setAttribute(Qt.WA_TranslucentBackground)
-            self.setWindowOpacity(0.95)
-        elif self.is_macos:
-            # macOS: Frameless with title bar for better compatibility
-            self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-            self.setAttribute(Qt.WA_TranslucentBackground)
-            self.setWindowOpacity(0.95)
-        else:
-            # Linux: Standard frameless
-            self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-            self.setAttribute(Qt.WA_TranslucentBackground)
-            self.setWindowOpacity(0.95)
+        # Frameless, translucent, always on top; same on every platform, but free to move and resize
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setWindowOpacity(0.95)
 
         self.stack = QStackedWidget()
         self.auth = AuthView()
         self.auth.authed.connect(self._on_authed)
         self.stack.addWidget(self.auth)
+        # Shown for the event-loop turn it takes to build MainView after login
+        self.loading = QLabel("Loading workspace…")
+        self.loading.setAlignment(Qt.AlignCenter)
+        self.loading.setStyleSheet(QSS_GLASS)
+        self.stack.addWidget(self.loading)
 
         lay = QVBoxLayout(self)
         lay.setContentsMargins(0, 0, 0, 0)
@@ -1489,26 +2357,30 @@ class MainWindow(QWidget):
         # Set default size and position, but allow free movement and resizing
         self.resize(900, 500)
         self.move(60, 60)
-        
-        # Enable free window movement and resizing
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)
 
         # Install global hotkey for hide/unhide that works even when window is hidden
         self._install_global_hotkey()
 
     def _on_authed(self, email, password, credits):
-        self.main = MainView(email, password, credits)
+        # Swap to the placeholder now so the login transition paints before the heavy build
+        self.stack.setCurrentWidget(self.loading)
+        QTimer.singleShot(0, lambda: self._finish_auth(email, password, credits))
+
+    def _finish_auth(self, email, password, credits):
+        self.main = MainView(email, password, credits, token=self.auth.token, verify_token=self.auth.warm_start)
         self.main.request_logout.connect(self._back_to_login)
-        if self.stack.count() == 2:
-            self.stack.removeWidget(self.stack.widget(1))
+        if self.stack.count() == 3:
+            self.stack.removeWidget(self.stack.widget(2))
         self.stack.addWidget(self.main)
         self.stack.setCurrentWidget(self.main)
 
     # Install global hotkey for hide/unhide that works even when hidden
 
-    def _back_to_login(self):
-        # clear session file already in MainView
+    def _back_to_login(self, message=""):
+        # clear session file already in MainView; the view has scheduled its own deletion
+        self.stack.removeWidget(self.main)
+        del self.main
+        self.auth.show_login(message)
         self.stack.setCurrentWidget(self.auth)
     
     def _install_global_hotkey(self):